@@ -1,4 +1,6 @@
+import asyncio
 import os
+import signal
 import sys
 import discord
 from discord.ext import commands
@@ -6,6 +8,7 @@ from dotenv import load_dotenv
 import traceback
 
 from utils.logger import logger
+from utils.timers import TimerWheel
 
 # 🔒 Ne lancer que via systemd
 if os.getenv("INVOCATION_BY_SYSTEMD") != "1":
@@ -19,6 +22,8 @@ TOKEN = os.getenv("DISCORD_TOKEN")
 intents = discord.Intents.all()
 bot = commands.Bot(command_prefix="!", intents=intents, help_command=None)
 bot.remove_command("help")
+# Roue de minuteurs partagée par les cogs (suppressions différées, délais de jeu)
+bot.timers = TimerWheel()
 
 async def load_cogs():
     cogs_folder = os.path.join(os.path.dirname(__file__), "cogs")
@@ -32,6 +37,15 @@ async def load_cogs():
         except Exception as e:
             logger.error(f"❌ Erreur au chargement du cog {ext} : {e}\n{traceback.format_exc()}")
 
+@bot.event
+async def setup_hook():
+    # Enregistre les commandes slash (ex. /guess) auprès de Discord
+    try:
+        synced = await bot.tree.sync()
+        logger.info(f"🔁 {len(synced)} commandes slash synchronisées")
+    except Exception as e:
+        logger.error(f"❌ Erreur de synchronisation des commandes slash : {e}")
+
 @bot.event
 async def on_ready():
     logger.info(f"🤖 {bot.user} est connecté et prêt !")
@@ -52,10 +66,13 @@ async def on_message(message: discord.Message):
     await bot.process_commands(message)
 
 async def main():
+    # systemctl stop/restart envoie SIGTERM : on ferme le bot proprement pour
+    # que les cogs soient déchargés et fassent leur dernière sauvegarde
+    loop = asyncio.get_running_loop()
+    loop.add_signal_handler(signal.SIGTERM, lambda: asyncio.create_task(bot.close()))
     async with bot:
         await load_cogs()
         await bot.start(TOKEN)
 
 if __name__ == "__main__":
-    import asyncio
     asyncio.run(main())
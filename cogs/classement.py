@@ -1,14 +1,57 @@
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 from collections import defaultdict, Counter
 import asyncio
 import os
 import json
+from datetime import datetime
+from typing import Optional
 
-from config import EXCLUDED_CHANNEL_IDS
+import pytz
+
+from config import (
+    ADMIN_ROLE_ID,
+    EXCLUDED_CHANNEL_IDS,
+    CLASSEMENT_FLUSH_INTERVAL,
+    CLASSEMENT_FLUSH_THRESHOLD,
+    CLASSEMENT_JOURNAL,
+    CLASSEMENT_COMPACT_INTERVAL,
+    CLASSEMENT_COMPACT_THRESHOLD,
+    CLASSEMENT_WINDOW_BUCKETS,
+    CLASSEMENT_NAME_CACHE_SIZE,
+    CLASSEMENT_PRUNE_INTERVAL,
+    CLASSEMENT_VOICE_CHECKPOINT,
+)
 from utils.logger import logger
+from utils.buckets import BucketRing, day_period, week_period, month_period
+from utils.journal import EventJournal
+from utils.names import NameResolver
+from utils.ranking import RankedIndex
+from utils.storage import atomic_write_json
+from utils.timers import delete_quietly
 
 DATA_PATH = "data/classement.json"
+JOURNAL_PATH = "data/classement.journal"
+CATEGORIES = ("messages", "vocal", "guess")
+KIND_CATEGORY = {"m": "messages", "v": "vocal", "g": "guess"}
+PAGE_SIZE = 10
+PARIS_TZ = pytz.timezone("Europe/Paris")
+PERIODS = {
+    "jour": day_period,
+    "semaine": week_period,
+    "mois": month_period,
+}
+
+
+class CategoryConverter(commands.Converter):
+    """Catégorie de classement, insensible à la casse."""
+
+    async def convert(self, ctx, argument):
+        categorie = argument.lower()
+        if categorie not in CATEGORIES:
+            raise commands.BadArgument(f"Catégorie inconnue : {argument}")
+        return categorie
+
 
 class Classement(commands.Cog):
     def __init__(self, bot):
@@ -17,35 +60,215 @@ class Classement(commands.Cog):
         self.message_counts = Counter()
         self.voice_times = defaultdict(int)
         self.voice_states = {}
+        # Un index trié par catégorie, reconstruit après chaque chargement
+        self.indexes = {}
+        # Classements jour / semaine / mois : anneaux de seaux par période
+        self.windows = self._new_windows()
+        # Embeds déjà rendus : (guild, catégorie, période) -> (version, embed)
+        self.embed_cache = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+        # Noms affichés (membres présents ou partis), résolus par lot
+        self.names = NameResolver(CLASSEMENT_NAME_CACHE_SIZE)
+        self.pruned_users = 0
+
+        # Écriture différée : les compteurs restent en mémoire et sont
+        # sauvegardés par lot (intervalle ou seuil de modifications).
+        self.dirty = 0                # modifications pas encore écrites
+        self.flush_count = 0          # écritures réellement effectuées
+        self.coalesced_writes = 0     # écritures évitées grâce au regroupement
+        self._flush_lock = asyncio.Lock()
+        self._flush_pending = None
+        self._writing = None          # écriture en cours dans un thread
+
+        # Mode journal : chaque incrément est ajouté à JOURNAL_PATH et
+        # l'écriture de l'instantané devient une compaction périodique.
+        self.journal = EventJournal(JOURNAL_PATH) if CLASSEMENT_JOURNAL else None
+        self.flush_threshold = CLASSEMENT_FLUSH_THRESHOLD
+        if self.journal:
+            self.flush_threshold = CLASSEMENT_COMPACT_THRESHOLD
+            self.flush_loop.change_interval(seconds=CLASSEMENT_COMPACT_INTERVAL)
 
         self.load_scores()
+        self.flush_loop.start()
+        self.prune_departed.change_interval(hours=CLASSEMENT_PRUNE_INTERVAL)
+        self.prune_departed.start()
+        self.voice_checkpoint.start()
+
+    async def cog_unload(self):
+        self.flush_loop.cancel()
+        self.prune_departed.cancel()
+        self.voice_checkpoint.cancel()
+        # Crédite les sessions ouvertes avant la sauvegarde finale
+        now = asyncio.get_event_loop().time()
+        for user_id, start in list(self.voice_states.items()):
+            self.voice_states[user_id] = self._credit_voice(user_id, start, now)
+        # Une sauvegarde déjà lancée doit finir avant la dernière, sinon son
+        # instantané plus ancien pourrait écraser celui-ci
+        pending = [task for task in (self._flush_pending, self._writing) if task is not None]
+        await asyncio.gather(*pending, return_exceptions=True)
+        async with self._flush_lock:
+            if self.dirty:
+                self.save_scores()
+        if self.journal:
+            self.journal.close()
 
     # ---------- Sauvegarde & Chargement ----------
-    def save_scores(self):
+    def _counter(self, kind):
+        if kind == "m":
+            return self.message_counts
+        if kind == "v":
+            return self.voice_times
+        return self.guess_scores
+
+    def _build_indexes(self):
+        self.indexes = {
+            "messages": RankedIndex(self.message_counts),
+            "vocal": RankedIndex(self.voice_times),
+            "guess": RankedIndex(self.guess_scores),
+        }
+
+    def _new_windows(self):
+        return {
+            category: {
+                period: BucketRing(period_of, CLASSEMENT_WINDOW_BUCKETS[period])
+                for period, period_of in PERIODS.items()
+            }
+            for category in CATEGORIES
+        }
+
+    def _increment(self, kind, user_id, value=1):
+        now = datetime.now(PARIS_TZ)
+        category = KIND_CATEGORY[kind]
+        self.indexes[category].add(user_id, value)
+        for ring in self.windows[category].values():
+            ring.add(user_id, value, now)
+        if self.journal:
+            try:
+                self.journal.append(kind, user_id, value, now.timestamp())
+            except Exception as e:
+                logger.error(f"[Classement] Erreur écriture journal : {e}")
+        self.mark_dirty()
+
+    def _forget(self, user_id):
+        for category in CATEGORIES:
+            self.indexes[category].discard(user_id)
+            for ring in self.windows[category].values():
+                ring.discard(user_id)
+        if self.journal:
+            try:
+                self.journal.append("x", user_id, 0, datetime.now(PARIS_TZ).timestamp())
+            except Exception as e:
+                logger.error(f"[Classement] Erreur écriture journal : {e}")
+        self.mark_dirty()
+
+    def snapshot(self):
         data = {
             "messages": dict(self.message_counts),
             "vocal": dict(self.voice_times),
-            "guess": dict(self.guess_scores)
+            "guess": dict(self.guess_scores),
+            "windows": {
+                category: {period: ring.to_list() for period, ring in rings.items()}
+                for category, rings in self.windows.items()
+            }
         }
-        os.makedirs("data", exist_ok=True)
+        if self.journal:
+            data["seq"] = self.journal.seq
+        return data
+
+    def save_scores(self):
         try:
-            with open(DATA_PATH, "w", encoding="utf-8") as f:
-                json.dump(data, f)
+            if self.journal:
+                # Instantané et rotation pris ensemble : seq est cohérent
+                self.journal.rotate()
+            atomic_write_json(DATA_PATH, self.snapshot())
+            if self.journal:
+                self.journal.discard_rotated()
+            self._record_flush(self.dirty)
         except Exception as e:
             logger.error(f"[Classement] Erreur sauvegarde : {e}")
 
+    def _record_flush(self, pending):
+        self.dirty -= pending
+        self.flush_count += 1
+        if pending > 1:
+            self.coalesced_writes += pending - 1
+
+    def mark_dirty(self):
+        self.dirty += 1
+        if self.dirty >= self.flush_threshold and (
+            self._flush_pending is None or self._flush_pending.done()
+        ):
+            self._flush_pending = self.bot.loop.create_task(self.flush())
+
+    async def flush(self):
+        async with self._flush_lock:
+            pending = self.dirty
+            if not pending:
+                return
+            # Copie prise sur la boucle, écriture disque dans un thread
+            try:
+                if self.journal:
+                    self.journal.rotate()
+                data = self.snapshot()
+                # Protégée de l'annulation : cog_unload attend la fin de l'écriture
+                self._writing = asyncio.ensure_future(asyncio.to_thread(atomic_write_json, DATA_PATH, data))
+                await asyncio.shield(self._writing)
+                if self.journal:
+                    self.journal.discard_rotated()
+            except Exception as e:
+                logger.error(f"[Classement] Erreur sauvegarde : {e}")
+                return
+            self._record_flush(pending)
+
+    @tasks.loop(seconds=CLASSEMENT_FLUSH_INTERVAL)
+    async def flush_loop(self):
+        await self.flush()
+
     def load_scores(self):
+        last_seq = 0
         try:
-            if not os.path.exists(DATA_PATH):
-                return
-            with open(DATA_PATH, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            self.message_counts = Counter({int(k): v for k, v in data.get("messages", {}).items()})
-            self.voice_times = defaultdict(int, {int(k): v for k, v in data.get("vocal", {}).items()})
-            self.guess_scores = Counter({int(k): v for k, v in data.get("guess", {}).items()})
+            if os.path.exists(DATA_PATH):
+                with open(DATA_PATH, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                self.message_counts = Counter({int(k): v for k, v in data.get("messages", {}).items()})
+                self.voice_times = defaultdict(int, {int(k): v for k, v in data.get("vocal", {}).items()})
+                self.guess_scores = Counter({int(k): v for k, v in data.get("guess", {}).items()})
+                for category, rings in data.get("windows", {}).items():
+                    for period, buckets in rings.items():
+                        if category in self.windows and period in self.windows[category]:
+                            self.windows[category][period].load(buckets)
+                last_seq = data.get("seq", 0)
         except Exception as e:
             logger.error(f"[Classement] Erreur chargement : {e}")
 
+        if not self.journal:
+            self._build_indexes()
+            return
+        try:
+            replayed = self.journal.replay(after_seq=last_seq)
+            now = datetime.now(PARIS_TZ)
+            for _, kind, user_id, value, timestamp in replayed:
+                if kind == "x":
+                    # Membre parti, retiré des classements
+                    for counter in (self.message_counts, self.voice_times, self.guess_scores):
+                        counter.pop(user_id, None)
+                    for rings in self.windows.values():
+                        for ring in rings.values():
+                            ring.discard(user_id)
+                    continue
+                self._counter(kind)[user_id] += value
+                when = datetime.fromtimestamp(timestamp, PARIS_TZ) if timestamp else now
+                for ring in self.windows[KIND_CATEGORY[kind]].values():
+                    ring.add(user_id, value, when)
+            self.dirty = len(replayed)
+            if replayed:
+                logger.info(f"[Classement] {len(replayed)} événements rejoués depuis le journal")
+        except Exception as e:
+            logger.error(f"[Classement] Erreur relecture du journal : {e}")
+        self.journal.open(last_seq)
+        self._build_indexes()
+
     # ---------- Listeners ----------
     @commands.Cog.listener()
     async def on_message(self, message):
@@ -54,8 +277,7 @@ class Classement(commands.Cog):
             message.guild and
             message.channel.id not in EXCLUDED_CHANNEL_IDS
         ):
-            self.message_counts[message.author.id] += 1
-            self.save_scores()
+            self._increment("m", message.author.id)
 
     @commands.Cog.listener()
     async def on_voice_state_update(self, member, before, after):
@@ -67,15 +289,89 @@ class Classement(commands.Cog):
             elif before.channel is not None and after.channel is None:
                 start = self.voice_states.pop(member.id, None)
                 if start:
-                    duration = int(asyncio.get_event_loop().time() - start)
-                    self.voice_times[member.id] += duration
-                    self.save_scores()
+                    self._credit_voice(member.id, start, asyncio.get_event_loop().time())
         except Exception as e:
             logger.error(f"[Classement] Erreur dans on_voice_state_update : {e}")
 
+    def _credit_voice(self, user_id, start, now):
+        """Crédite les secondes entières écoulées depuis `start` et renvoie
+        le nouveau point de départ de la session (reste conservé)."""
+        duration = int(now - start)
+        if duration > 0:
+            self._increment("v", user_id, duration)
+        return start + duration
+
+    @tasks.loop(seconds=CLASSEMENT_VOICE_CHECKPOINT)
+    async def voice_checkpoint(self):
+        # Crédite régulièrement les sessions ouvertes : un redémarrage ne
+        # perd au plus qu'un intervalle, et pas de grosse écriture à la sortie.
+        now = asyncio.get_event_loop().time()
+        for user_id, start in list(self.voice_states.items()):
+            self.voice_states[user_id] = self._credit_voice(user_id, start, now)
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        # Réconciliation : un seul passage sur les salons vocaux pour rouvrir
+        # les sessions des membres déjà connectés et fermer celles perdues.
+        try:
+            now = asyncio.get_event_loop().time()
+            connected = set()
+            for guild in self.bot.guilds:
+                for channel in (*guild.voice_channels, *guild.stage_channels):
+                    for member in channel.members:
+                        connected.add(member.id)
+                        self.voice_states.setdefault(member.id, now)
+            for user_id in [uid for uid in self.voice_states if uid not in connected]:
+                self._credit_voice(user_id, self.voice_states.pop(user_id), now)
+            logger.info(f"[Classement] {len(connected)} sessions vocales en cours après réconciliation")
+        except Exception as e:
+            logger.error(f"[Classement] Erreur réconciliation vocale : {e}")
+
+    @commands.Cog.listener()
+    async def on_member_remove(self, member):
+        # On garde son nom pour l'affichage tant qu'il reste classé
+        self.names.remember(member.id, member.display_name)
+
+    @tasks.loop(hours=24)
+    async def prune_departed(self):
+        """Retire des classements les membres qui ne sont plus sur aucun serveur."""
+        await self.bot.wait_until_ready()
+        guilds = self.bot.guilds
+        if not guilds or not all(guild.chunked for guild in guilds):
+            # Sans liste complète des membres, impossible de savoir qui est parti
+            return
+        ranked = set()
+        for index in self.indexes.values():
+            ranked.update(index.scores)
+        departed = []
+        for i, user_id in enumerate(ranked):
+            if all(guild.get_member(user_id) is None for guild in guilds):
+                departed.append(user_id)
+            if i % 1000 == 999:
+                await asyncio.sleep(0)
+        for user_id in departed:
+            self._forget(user_id)
+            self.names.forget(user_id)
+        if departed:
+            self.pruned_users += len(departed)
+            logger.info(f"[Classement] {len(departed)} membres partis retirés des classements")
+
     def add_guess_win(self, user_id):
-        self.guess_scores[user_id] += 1
-        self.save_scores()
+        self._increment("g", user_id)
+
+    @commands.command(name="classementstats", hidden=True)
+    @commands.has_role(ADMIN_ROLE_ID)
+    async def classement_stats(self, ctx):
+        """Statistiques internes de la sauvegarde du classement."""
+        embed = discord.Embed(title="📈 Stats Classement", color=0x7289da)
+        embed.add_field(name="Écritures disque", value=str(self.flush_count), inline=True)
+        embed.add_field(name="Écritures regroupées", value=str(self.coalesced_writes), inline=True)
+        embed.add_field(name="Modifications en attente", value=str(self.dirty), inline=True)
+        embed.add_field(name="Cache embeds (hits)", value=str(self.cache_hits), inline=True)
+        embed.add_field(name="Cache embeds (misses)", value=str(self.cache_misses), inline=True)
+        embed.add_field(name="Requêtes membres (gateway)", value=str(self.names.gateway_queries), inline=True)
+        embed.add_field(name="Membres partis retirés", value=str(self.pruned_users), inline=True)
+        await ctx.send(embed=embed)
 
     # ---------- Commande Classement ----------
     @commands.command(name="classement", help="Affiche le classement général")
@@ -84,59 +380,104 @@ class Classement(commands.Cog):
             view = ClassementView(self, ctx.guild)
             message = await ctx.send("**Sélectionne une catégorie de classement :**", view=view)
 
-            # Supprime la commande utilisateur après 3 sec
-            async def delete_user_command():
-                await asyncio.sleep(3)
-                try:
-                    await ctx.message.delete()
-                except Exception:
-                    pass
-
-            # Suppression auto du menu après 3min
-            async def auto_delete():
-                await asyncio.sleep(180)
-                try:
-                    await message.delete()
-                except Exception:
-                    pass
-            ctx.bot.loop.create_task(auto_delete())
-            ctx.bot.loop.create_task(delete_user_command())
+            # Supprime la commande utilisateur après 3 sec, le menu après 3 min
+            ctx.bot.timers.schedule(3, delete_quietly, ctx.message)
+            ctx.bot.timers.schedule(180, delete_quietly, message)
         except Exception as e:
             logger.error(f"[Classement] Erreur affichage du classement : {e}")
             await ctx.send("Erreur lors de l’affichage du classement.")
 
+    # ---------- Commande Rang ----------
+    @commands.command(name="rang", help="Affiche ta position (ou celle d'un membre) dans un classement")
+    async def rang(self, ctx, categorie: Optional[CategoryConverter] = None, membre: discord.Member = None):
+        # Catégorie facultative : « !rang @membre » passe directement au membre
+        categorie = categorie or "messages"
+        membre = membre or ctx.author
+        try:
+            index = self.indexes[categorie]
+            position, voisins = index.around(membre.id, radius=2)
+            title, _ = CATEGORY_LABELS[categorie]
+            if position is None:
+                embed = discord.Embed(
+                    title=title,
+                    description=f"{membre.display_name} n'est pas encore classé·e.",
+                    color=0x7289da
+                )
+                await ctx.send(embed=embed)
+                return
+
+            embed = discord.Embed(
+                title=title,
+                description=f"**{membre.display_name}** est **{position + 1}ᵉ** sur {len(index)}.",
+                color=0x7289da
+            )
+            names = await self.names.resolve(ctx.guild, [user_id for _, user_id, _ in voisins])
+            for pos, user_id, score in voisins:
+                name = names.get(user_id, f"Utilisateur inconnu ({user_id})")
+                marker = "➡️ " if user_id == membre.id else ""
+                embed.add_field(
+                    name=f"{marker}{pos + 1}. {name}",
+                    value=format_score(categorie, score),
+                    inline=False
+                )
+            await ctx.send(embed=embed)
+        except Exception as e:
+            logger.error(f"[Classement] Erreur commande rang : {e}")
+            await ctx.send("Erreur lors de l’affichage du rang.")
+
+    @rang.error
+    async def rang_error(self, ctx, error):
+        if isinstance(error, commands.BadArgument):
+            await ctx.send("Catégorie ou membre inconnu. Catégories : `messages`, `vocal`, `guess`.")
+        else:
+            logger.error(f"[Classement] Erreur commande rang : {error}")
+
     # ---------- Génération de l'embed ----------
-    def get_classement_embed(self, guild, category):
+    def get_ranking(self, category, period="total"):
+        if period == "total":
+            return self.indexes[category]
+        return self.windows[category][period].get(datetime.now(PARIS_TZ))
+
+    def page_count(self, category, period="total"):
+        index = self.get_ranking(category, period)
+        total = len(index) if index else 0
+        return max(1, -(-total // PAGE_SIZE))
+
+    async def get_classement_embed(self, guild, category, period="total", page=0):
         try:
-            if category == "messages":
-                counts = self.message_counts
-                title = "🏆 Classement Messages"
-                desc = "Les membres les plus bavards !"
-            elif category == "vocal":
-                counts = Counter(self.voice_times)
-                title = "🎙️ Classement Vocal"
-                desc = "Ceux qui squattent le plus les vocaux !"
-            else:  # guess
-                counts = self.guess_scores
-                title = "🎮 Classement !guess"
-                desc = "Score du mini-jeu !guess"
-
-            top = counts.most_common(10)
+            index = self.get_ranking(category, period)
+            pages = self.page_count(category, period)
+            page = min(page, pages - 1)
+            # Seule la première page est mise en cache : sa version ne bouge
+            # que si le top 10 change (ou si le nombre de pages change).
+            stamp = (index.version if index else 0, pages)
+            key = (guild.id, category, period)
+            if page == 0:
+                cached = self.embed_cache.get(key)
+                if cached is not None and cached[0] == stamp:
+                    self.cache_hits += 1
+                    return cached[1]
+                self.cache_misses += 1
+
+            title, desc = CATEGORY_LABELS[category]
+            if period != "total":
+                title = f"{title} — {PERIOD_LABELS[period]}"
+            # Page lue directement à sa position dans l'index : O(log n + 10)
+            rows = index.page(page * PAGE_SIZE, PAGE_SIZE) if index else []
+            names = await self.names.resolve(guild, [user_id for _, user_id, _ in rows])
             embed = discord.Embed(title=title, description=desc, color=0x7289da)
-            for i, (user_id, score) in enumerate(top, 1):
-                member = guild.get_member(user_id)
-                name = member.display_name if member else f"Utilisateur inconnu ({user_id})"
-                if category == "vocal":
-                    value = f"{score//3600}h {(score%3600)//60}min"
-                else:
-                    value = str(score)
+            for position, user_id, score in rows:
+                name = names.get(user_id, f"Utilisateur inconnu ({user_id})")
                 embed.add_field(
-                    name=f"{i}. {name}",
-                    value=value,
+                    name=f"{position + 1}. {name}",
+                    value=format_score(category, score),
                     inline=False
                 )
-            if not top:
+            if not rows:
                 embed.description = "Pas encore de données."
+            embed.set_footer(text=f"Page {page + 1}/{pages}")
+            if page == 0:
+                self.embed_cache[key] = (stamp, embed)
             return embed
         except Exception as e:
             logger.error(f"[Classement] Erreur dans get_classement_embed : {e}")
@@ -147,14 +488,56 @@ class Classement(commands.Cog):
             )
             return embed
 
+CATEGORY_LABELS = {
+    "messages": ("🏆 Classement Messages", "Les membres les plus bavards !"),
+    "vocal": ("🎙️ Classement Vocal", "Ceux qui squattent le plus les vocaux !"),
+    "guess": ("🎮 Classement !guess", "Score du mini-jeu !guess"),
+}
+
+PERIOD_LABELS = {
+    "jour": "Aujourd'hui",
+    "semaine": "Cette semaine",
+    "mois": "Ce mois-ci",
+}
+
+def format_score(category, score):
+    if category == "vocal":
+        return f"{score//3600}h {(score%3600)//60}min"
+    return str(score)
+
 # ---------- UI Discord ----------
 class ClassementView(discord.ui.View):
     def __init__(self, cog, guild):
         super().__init__(timeout=180)
         self.cog = cog
         self.guild = guild
+        self.category = "messages"
+        self.period = "total"
+        self.page = 0
         self.clear_items()
         self.add_item(ClassementSelect(cog, guild, self))
+        self.add_item(PeriodeSelect(self))
+        self.previous_button = PageButton(self, -1, "⬅️ Précédent")
+        self.next_button = PageButton(self, 1, "Suivant ➡️")
+        self.add_item(self.previous_button)
+        self.add_item(self.next_button)
+
+    async def refresh(self, interaction: discord.Interaction):
+        try:
+            pages = self.cog.page_count(self.category, self.period)
+            self.page = max(0, min(self.page, pages - 1))
+            self.previous_button.disabled = self.page == 0
+            self.next_button.disabled = self.page >= pages - 1
+            embed = await self.cog.get_classement_embed(self.guild, self.category, self.period, self.page)
+            await interaction.response.edit_message(embed=embed, view=self)
+        except Exception as e:
+            try:
+                await interaction.response.send_message(
+                    "Une erreur est survenue lors de l’affichage du classement. Contacte un admin.",
+                    ephemeral=True
+                )
+            except:
+                pass
 
 class ClassementSelect(discord.ui.Select):
     def __init__(self, cog, guild, view):
@@ -169,18 +552,35 @@ class ClassementSelect(discord.ui.Select):
         self.parent_view = view
 
     async def callback(self, interaction: discord.Interaction):
-        try:
-            category = self.values[0]
-            embed = self.cog.get_classement_embed(self.guild, category)
-            await interaction.response.edit_message(embed=embed, view=self.parent_view)
-        except Exception as e:
-            try:
-                await interaction.response.send_message(
-                    "Une erreur est survenue lors de l’affichage du classement. Contacte un admin.",
-                    ephemeral=True
-                )
-            except:
-                pass
+        self.parent_view.category = self.values[0]
+        self.parent_view.page = 0
+        await self.parent_view.refresh(interaction)
+
+class PeriodeSelect(discord.ui.Select):
+    def __init__(self, view):
+        options = [
+            discord.SelectOption(label="Depuis toujours", value="total", description="Classement général"),
+            discord.SelectOption(label="Aujourd'hui", value="jour", description="Classement du jour"),
+            discord.SelectOption(label="Cette semaine", value="semaine", description="Classement de la semaine"),
+            discord.SelectOption(label="Ce mois-ci", value="mois", description="Classement du mois"),
+        ]
+        super().__init__(placeholder="Choisis une période", min_values=1, max_values=1, options=options)
+        self.parent_view = view
+
+    async def callback(self, interaction: discord.Interaction):
+        self.parent_view.period = self.values[0]
+        self.parent_view.page = 0
+        await self.parent_view.refresh(interaction)
+
+class PageButton(discord.ui.Button):
+    def __init__(self, view, step, label):
+        super().__init__(label=label, style=discord.ButtonStyle.secondary, disabled=True)
+        self.parent_view = view
+        self.step = step
+
+    async def callback(self, interaction: discord.Interaction):
+        self.parent_view.page += self.step
+        await self.parent_view.refresh(interaction)
 
 async def setup(bot):
     await bot.add_cog(Classement(bot))
@@ -1,18 +1,48 @@
-import json
 import os
-import random
+import json
+import time
 import asyncio
-from collections import defaultdict
 
 import discord
-from discord.ext import commands
-
+from discord import app_commands
+from discord.ext import commands, tasks
+
+from guess_character.cards import CardCache
+from guess_character.catalog import CharacterCatalog
+from guess_character.coalescer import EditCoalescer
+from guess_character.matching import normalize, is_correct
+from guess_character.pool import ChannelPool
+from guess_character.registry import GameChannelRegistry
+from guess_character.router import MessageRouter
+from guess_character.sampler import CharacterSampler, TYPE_PREFIX
+from guess_character.transport import ChannelTransport, ThreadTransport
+from utils.keyed_lock import KeyedLock
 from utils.logger import logger
-from config import GUESS_CHANNEL_ID, GAME_CATEGORY_ID, EXCLUDED_CHANNEL_IDS
+from utils.storage import atomic_write_json
+from utils.timers import delete_quietly
+from config import (
+    ADMIN_ROLE_ID,
+    GUESS_CHANNEL_ID,
+    GAME_CATEGORY_ID,
+    EXCLUDED_CHANNEL_IDS,
+    GUESS_CATALOG_CHECK_INTERVAL,
+    GUESS_SERIES_WEIGHTS,
+    GUESS_POOL_SIZE,
+    GUESS_POOL_LOW_WATERMARK,
+    GUESS_POOL_REFILL_INTERVAL,
+    GUESS_GAME_MODE,
+    GUESS_EDIT_WINDOW,
+    GUESS_SESSION_FLUSH_INTERVAL,
+    GUESS_RACE_TIMEOUT,
+    GUESS_CARD_CACHE_SIZE,
+    GUESS_BAG_CACHE_SIZE,
+)
 
-creation_locks = defaultdict(asyncio.Lock)
 active_guess_ctx = set()
 PLAYER_MARKER = "player_id:"
+BAGS_PATH = "data/guess_bags.json"
+SESSIONS_PATH = "data/guess_sessions.json"
+RACE_DRAWER = 0          # Tirages sans répétition partagés par toutes les courses
 
 class GuessCharacter(commands.Cog, name="Jeu"):
     def __init__(self, bot):
@@ -23,40 +53,319 @@ class GuessCharacter(commands.Cog, name="Jeu"):
             "data",
             "personnages.json"
         )
-        self.personnages = []
-        self.load_characters()
-
-    def load_characters(self):
+        self.catalog = CharacterCatalog(self.json_path)
+        # Tirages sans répétition par joueur (graine + curseur persistés)
+        self.sampler = CharacterSampler(GUESS_SERIES_WEIGHTS, GUESS_BAG_CACHE_SIZE)
+        # Indices, réponses et embeds précalculés par personnage
+        self.cards = CardCache(GUESS_CARD_CACHE_SIZE)
+        # Joueur -> salon de partie, reconstruit au démarrage
+        self.registry = GameChannelRegistry()
+        # Salon -> partie en cours, consulté par l'unique listener on_message
+        self.router = MessageRouter()
+        # Verrous par joueur, uniquement autour de la création du salon
+        self.creation_locks = KeyedLock()
+        # Salons pré-créés loués aux parties au lieu de créer/supprimer
+        self.pool = ChannelPool(GUESS_POOL_SIZE, GUESS_POOL_LOW_WATERMARK)
+        # Modifications regroupées des messages de jeu
+        self.edits = EditCoalescer(GUESS_EDIT_WINDOW)
+        # Support des parties : salon privé de la réserve ou fil privé
+        if GUESS_GAME_MODE == "fil":
+            self.transport = ThreadTransport(GUESS_CHANNEL_ID)
+        else:
+            self.transport = ChannelTransport(self.pool, GAME_CATEGORY_ID)
+        # Instantanés des parties en cours, écrits par lots
+        self.sessions_dirty = False
+        self.sessions_resumed = False
+        # Écritures en cours dans un thread, attendues par cog_unload
+        self._writes = set()
+
+    async def cog_load(self):
+        # Chargement initial dans un thread, puis surveillance du fichier
+        try:
+            self.sampler.load(await asyncio.to_thread(self.read_bags))
+        except Exception as e:
+            logger.error(f"[GuessCharacter] Erreur chargement des tirages : {e}")
+        await self.refresh_catalog()
+        self.watch_catalog.change_interval(seconds=GUESS_CATALOG_CHECK_INTERVAL)
+        self.watch_catalog.start()
+        self.save_bags.start()
+        # Vues persistantes : les boutons des parties reprises restent actifs
+        self.bot.add_view(SkipView(self))
+        self.bot.add_view(EndGameView(self))
+        self.save_sessions.change_interval(seconds=GUESS_SESSION_FLUSH_INTERVAL)
+        self.save_sessions.start()
+        if self.transport.mode == "salon":
+            self.refill_pool.change_interval(seconds=GUESS_POOL_REFILL_INTERVAL)
+            self.refill_pool.start()
+
+    def read_bags(self):
+        if not os.path.exists(BAGS_PATH):
+            return {}
+        with open(BAGS_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    async def refresh_catalog(self, force=False):
+        changed = await self.catalog.reload(force=force)
+        if changed or self.sampler.snapshot is None:
+            self.sampler.bind(self.catalog.snapshot)
+        return changed
+
+    @tasks.loop(seconds=60)
+    async def watch_catalog(self):
+        await self.refresh_catalog()
+
+    async def write_json(self, path, data):
+        """Écriture dans un thread, protégée de l'annulation : cog_unload l'attend."""
+        write = asyncio.ensure_future(asyncio.to_thread(atomic_write_json, path, data))
+        self._writes.add(write)
+        write.add_done_callback(self._writes.discard)
+        await asyncio.shield(write)
+
+    @tasks.loop(seconds=60)
+    async def save_bags(self):
+        if not self.sampler.dirty:
+            return
+        self.sampler.dirty = False
+        try:
+            await self.write_json(BAGS_PATH, self.sampler.to_dict())
+        except Exception as e:
+            self.sampler.dirty = True
+            logger.error(f"[GuessCharacter] Erreur sauvegarde des tirages : {e}")
+
+    def session_snapshots(self):
+        return [
+            session.snapshot() for session in self.router.handlers()
+            if isinstance(session, GameSession) and session.state != GameSession.CLOSED
+        ]
+
+    @tasks.loop(seconds=10)
+    async def save_sessions(self):
+        if not self.sessions_dirty:
+            return
+        self.sessions_dirty = False
         try:
-            with open(self.json_path, "r", encoding="utf-8") as f:
-                self.personnages = json.load(f)
-            logger.info(f"[GuessCharacter] {len(self.personnages)} personnages chargés depuis {self.json_path}")
+            await self.write_json(SESSIONS_PATH, self.session_snapshots())
         except Exception as e:
-            logger.error(f"[GuessCharacter] Erreur lors du chargement : {e}")
-            self.personnages = []
+            self.sessions_dirty = True
+            logger.error(f"[GuessCharacter] Erreur sauvegarde des parties : {e}")
 
-    async def delete_message_after(self, message: discord.Message, delay: float):
-        await asyncio.sleep(delay)
+    def resume_sessions(self):
+        """Reprend les parties interrompues par un redémarrage (aucun appel REST)."""
+        start = time.perf_counter()
         try:
-            await message.delete()
-        except Exception:
-            pass
+            with open(SESSIONS_PATH, "r", encoding="utf-8") as f:
+                snapshots = json.load(f)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.error(f"[GuessCharacter] Erreur lecture des parties : {e}")
+            return
+        resumed = 0
+        for data in snapshots:
+            try:
+                session = GameSession.restore(self, data)
+            except Exception as e:
+                logger.error(f"[GuessCharacter] Partie {data.get('channel')} non reprise : {e}")
+                continue
+            if session is not None:
+                self.router.register(session.channel.id, session)
+                resumed += 1
+        self.sessions_dirty = True
+        logger.info(
+            f"[GuessCharacter] {resumed}/{len(snapshots)} parties reprises "
+            f"en {(time.perf_counter() - start) * 1000:.1f} ms"
+        )
 
-    def find_existing_private_channel(self, guild, user_id):
-        for channel in guild.text_channels:
-            if (
-                channel.category_id == GAME_CATEGORY_ID
-                and channel.topic is not None
-                and f"{PLAYER_MARKER}{user_id}" in channel.topic
-            ):
-                return channel
-        return None
+    @tasks.loop(seconds=60)
+    async def refill_pool(self):
+        for guild in self.bot.guilds:
+            category = guild.get_channel(GAME_CATEGORY_ID)
+            if isinstance(category, discord.CategoryChannel) and self.pool.needs_refill(guild):
+                created = await self.pool.refill(category)
+                if created:
+                    logger.info(f"[GuessCharacter] {created} salons ajoutés à la réserve")
+
+    @refill_pool.before_loop
+    async def before_refill_pool(self):
+        await self.bot.wait_until_ready()
+
+    @commands.command(name="reloadpersos", hidden=True)
+    @commands.has_role(ADMIN_ROLE_ID)
+    async def reload_characters(self, ctx):
+        """Force le rechargement de personnages.json."""
+        changed = await self.refresh_catalog(force=True)
+        état = "rechargé" if changed else "inchangé (ou erreur, voir les logs)"
+        await ctx.send(f"📚 Catalogue {état} : {len(self.catalog.snapshot)} personnages.")
+
+    @commands.command(name="reservesalons", hidden=True)
+    @commands.has_role(ADMIN_ROLE_ID)
+    async def pool_stats(self, ctx):
+        """Statistiques des salons (ou fils) de partie et de leur réserve."""
+        pool, transport = self.pool, self.transport
+        lease_ms = pool.lease_time / pool.leases * 1000 if pool.leases else 0
+        cold_ms = pool.cold_time / pool.cold_creates * 1000 if pool.cold_creates else 0
+        open_ms = transport.open_time / transport.opens * 1000 if transport.opens else 0
+        rest = transport.rest_calls / transport.opens if transport.opens else 0
+        embed = discord.Embed(title="🗄️ Salons de partie", color=0x7289da)
+        embed.add_field(name="Mode", value=transport.mode, inline=True)
+        embed.add_field(name="Ouvertures", value=str(transport.opens), inline=True)
+        embed.add_field(name="Latence ouverture", value=f"{open_ms:.0f} ms", inline=True)
+        embed.add_field(name="Appels REST", value=f"{transport.rest_calls} ({rest:.1f} / partie)", inline=True)
+        embed.add_field(name="Modifs demandées / envoyées",
+                        value=f"{self.edits.requested} / {self.edits.sent}", inline=True)
+        embed.add_field(name="Salons libres", value=f"{pool.idle_count(ctx.guild)} / {pool.size}", inline=True)
+        embed.add_field(name="Locations", value=str(pool.leases), inline=True)
+        embed.add_field(name="Créations à froid", value=str(pool.cold_creates), inline=True)
+        embed.add_field(name="Latence location", value=f"{lease_ms:.0f} ms", inline=True)
+        embed.add_field(name="Latence création", value=f"{cold_ms:.0f} ms", inline=True)
+        embed.add_field(name="Salons recyclés", value=str(pool.recycled), inline=True)
+        await ctx.send(embed=embed)
+
+    @commands.command(name="minuteurs", hidden=True)
+    @commands.has_role(ADMIN_ROLE_ID)
+    async def timer_stats(self, ctx):
+        """Statistiques de la roue de minuteurs partagée."""
+        timers = self.bot.timers
+        embed = discord.Embed(title="⏱️ Minuteurs", color=0x7289da)
+        embed.add_field(name="En attente", value=str(timers.pending), inline=True)
+        embed.add_field(name="Déclenchés", value=str(timers.fired), inline=True)
+        embed.add_field(name="Parties en cours", value=str(len(self.router)), inline=True)
+        embed.add_field(name="Retard moyen", value=f"{timers.lag_avg * 1000:.0f} ms", inline=True)
+        embed.add_field(name="Retard max", value=f"{timers.lag_max * 1000:.0f} ms", inline=True)
+        await ctx.send(embed=embed)
+
+    def delete_message_after(self, message: discord.Message, delay: float):
+        if delay <= 0:
+            asyncio.create_task(delete_quietly(message))
+        else:
+            self.bot.timers.schedule(delay, delete_quietly, message)
+
+    def player_of(self, channel):
+        """ID du joueur d'un salon de partie, sinon None."""
+        if getattr(channel, "category_id", None) != GAME_CATEGORY_ID:
+            return None
+        user_id = self.pool.tenant(channel)
+        if user_id is not None:
+            return user_id
+        # Salons créés avant la réserve : joueur inscrit dans le sujet
+        topic = getattr(channel, "topic", None)
+        if not topic or PLAYER_MARKER not in topic:
+            return None
+        rest = topic.split(PLAYER_MARKER, 1)[1].split()
+        return int(rest[0]) if rest and rest[0].isdigit() else None
+
+    def rebuild_registry(self):
+        self.registry.clear()
+        for guild in self.bot.guilds:
+            category = guild.get_channel(GAME_CATEGORY_ID)
+            if not isinstance(category, discord.CategoryChannel):
+                continue
+            for channel in category.text_channels:
+                user_id = self.player_of(channel)
+                if user_id is not None:
+                    self.registry.register(user_id, channel.id)
+        # Les fils n'apparaissent pas dans la catégorie : on repart des parties en cours
+        for session in self.router.handlers():
+            if isinstance(session, GameSession):
+                self.registry.register(session.player.id, session.channel.id)
+        logger.info(f"[GuessCharacter] {len(self.registry)} salons de partie retrouvés")
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        if not self.sessions_resumed:
+            self.sessions_resumed = True
+            self.resume_sessions()
+        self.rebuild_registry()
+        for guild in self.bot.guilds:
+            category = guild.get_channel(GAME_CATEGORY_ID)
+            if isinstance(category, discord.CategoryChannel):
+                self.pool.adopt(category)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_create(self, channel):
+        user_id = self.player_of(channel)
+        if user_id is not None:
+            self.registry.register(user_id, channel.id)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_update(self, before, after):
+        self.registry.unregister_channel(after.id)
+        user_id = self.player_of(after)
+        if user_id is not None:
+            self.registry.register(user_id, after.id)
+
+    @commands.Cog.listener()
+    async def on_thread_delete(self, thread):
+        await self.on_guild_channel_delete(thread)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel):
+        self.registry.unregister_channel(channel.id)
+        self.pool.forget(channel.id)
+        session = self.router.unregister(channel.id)
+        if session is not None:
+            session.dispose()
 
-    @commands.command(
+    def find_existing_private_channel(self, guild, user_id):
+        channel_id = self.registry.channel_of(user_id)
+        if channel_id is None:
+            return None
+        channel = guild.get_channel_or_thread(channel_id)
+        if channel is None:
+            # Salon disparu sans événement reçu : entrée périmée
+            self.registry.unregister_channel(channel_id)
+        return channel
+
+    async def ensure_game_channel(self, guild, member):
+        """Salon de partie du joueur : (salon, True) s'il vient d'être créé,
+        (salon existant, False) sinon. Seule cette décision est verrouillée."""
+        async with self.creation_locks(member.id):
+            existing_channel = self.find_existing_private_channel(guild, member.id)
+            if existing_channel is not None:
+                return existing_channel, False
+
+            game_channel = await self.transport.timed_open(guild, member)
+            if self.transport.mode == "salon" and self.pool.needs_refill(guild):
+                asyncio.create_task(self.pool.refill(self.transport.category(guild)))
+            if game_channel.id not in EXCLUDED_CHANNEL_IDS:
+                EXCLUDED_CHANNEL_IDS.append(game_channel.id)
+            self.registry.register(member.id, game_channel.id)
+            return game_channel, True
+
+    async def release_game_channel(self, channel):
+        """Fin de partie : le salon retourne vidé dans la réserve (ou le fil est archivé)."""
+        self.router.unregister(channel.id)
+        self.registry.unregister_channel(channel.id)
+        await self.transport.release(channel)
+
+    async def notify_existing_game(self, ctx, channel):
+        channel_url = f"https://discord.com/channels/{ctx.guild.id}/{channel.id}"
+        notice = await ctx.send(
+            f"⚠️ {ctx.author.mention}, tu as déjà une partie en cours ici :",
+            view=OpenChannelView(channel_url)
+        )
+        self.delete_message_after(ctx.message, 2)
+        self.delete_message_after(notice, 5)
+
+    def resolve_pool(self, catalog, query):
+        """Clé de tirage pour `!guess <anime>` : (clé, libellé) ou (None, suggestions)."""
+        norm = normalize(query)
+        if norm in catalog.by_type:
+            return f"{TYPE_PREFIX}{norm}", norm
+        title = catalog.titles.get(norm)
+        if title is None:
+            matches = catalog.title_index.search(query)
+            if len(matches) != 1:
+                return None, matches[:5]
+            title = matches[0]
+        return title, title
+
+    @commands.hybrid_command(
         name="guess",
-        help="Lance un jeu pour deviner un personnage d'anime.",
+        help="Lance un jeu pour deviner un personnage d'anime (optionnel : une série ou anime/manga).",
     )
-    async def guess_character(self, ctx):
+    @app_commands.describe(anime="Série ou type (anime/manga) à deviner")
+    async def guess_character(self, ctx, *, anime: str = None):
         uniq_id = (ctx.message.id, ctx.author.id)
         if uniq_id in active_guess_ctx:
             return
@@ -64,505 +373,581 @@ class GuessCharacter(commands.Cog, name="Jeu"):
 
         try:
             if ctx.channel.id != GUESS_CHANNEL_ID:
-                asyncio.create_task(self.delete_message_after(ctx.message, 0))
+                self.delete_message_after(ctx.message, 0)
                 err = await ctx.send(f"⚠️ Cette commande n’est disponible que dans le salon <#{GUESS_CHANNEL_ID}>.")
-                asyncio.create_task(self.delete_message_after(err, 5))
+                self.delete_message_after(err, 5)
                 return
 
             guild = ctx.guild
-            category = guild.get_channel(GAME_CATEGORY_ID)
-            if not category or not isinstance(category, discord.CategoryChannel):
+            if not self.transport.available(guild):
                 err = await ctx.send("⚠️ Impossible de trouver la catégorie de jeu. Contactez un administrateur.")
-                asyncio.create_task(self.delete_message_after(err, 5))
+                self.delete_message_after(err, 5)
                 return
 
-            lock = creation_locks[ctx.author.id]
-            async with lock:
-                existing_channel = self.find_existing_private_channel(guild, ctx.author.id)
-
-                if existing_channel is not None:
-                    channel_url = f"https://discord.com/channels/{guild.id}/{existing_channel.id}"
-                    class OpenChannelView(discord.ui.View):
-                        def __init__(self, url: str):
-                            super().__init__(timeout=None)
-                            self.add_item(
-                                discord.ui.Button(
-                                    label="🕹️ Ouvrir le salon privé",
-                                    style=discord.ButtonStyle.link,
-                                    url=url
-                                )
-                            )
-                    view_invite = OpenChannelView(channel_url)
-                    notice = await ctx.send(
-                        f"⚠️ {ctx.author.mention}, tu as déjà une partie en cours ici :",
-                        view=view_invite
-                    )
-                    asyncio.create_task(self.delete_message_after(ctx.message, 2))
-                    asyncio.create_task(self.delete_message_after(notice, 5))
-                    return
+            if ctx.interaction:
+                # Commande slash : la création du salon peut dépasser 3 s
+                await ctx.defer()
 
-                self.load_characters()
-                if not self.personnages:
-                    warning = await ctx.send("⚠️ Aucun personnage trouvé dans `personnages.json`. Vérifiez le chemin.")
-                    logger.warning("[GuessCharacter] Aucune donnée, commande annulée.")
-                    asyncio.create_task(self.delete_message_after(ctx.message, 2))
-                    asyncio.create_task(self.delete_message_after(warning, 5))
-                    return
+            existing_channel = self.find_existing_private_channel(guild, ctx.author.id)
+            if existing_channel is not None:
+                await self.notify_existing_game(ctx, existing_channel)
+                return
 
-                asyncio.create_task(self.delete_message_after(ctx.message, 2))
-
-                overwrites = {
-                    guild.default_role: discord.PermissionOverwrite(view_channel=False),
-                    ctx.author: discord.PermissionOverwrite(view_channel=True, send_messages=True, read_messages=True),
-                    guild.me: discord.PermissionOverwrite(view_channel=True, send_messages=True, read_messages=True)
-                }
-                try:
-                    game_channel = await guild.create_text_channel(
-                        name=f"guess-{ctx.author.name}",
-                        category=category,
-                        overwrites=overwrites,
-                        reason=f"Salon privé GuessCharacter pour {ctx.author}",
-                        topic=f"{PLAYER_MARKER}{ctx.author.id}"
-                    )
-                    if game_channel.id not in EXCLUDED_CHANNEL_IDS:
-                        EXCLUDED_CHANNEL_IDS.append(game_channel.id)
-                except Exception as e:
-                    logger.error(f"[GuessCharacter] Impossible de créer le salon privé pour {ctx.author} : {e}")
-                    err = await ctx.send("⚠️ Une erreur est survenue lors de la création du salon privé.")
-                    asyncio.create_task(self.delete_message_after(ctx.message, 2))
-                    asyncio.create_task(self.delete_message_after(err, 5))
-                    return
+            # Instantané figé pour toute la durée de la partie
+            catalog = self.catalog.snapshot
+            if not catalog.characters:
+                warning = await ctx.send("⚠️ Aucun personnage trouvé dans `personnages.json`. Vérifiez le chemin.")
+                logger.warning("[GuessCharacter] Aucune donnée, commande annulée.")
+                self.delete_message_after(ctx.message, 2)
+                self.delete_message_after(warning, 5)
+                return
 
-                channel_url = f"https://discord.com/channels/{guild.id}/{game_channel.id}"
-                class OpenChannelView(discord.ui.View):
-                    def __init__(self, url: str):
-                        super().__init__(timeout=None)
-                        self.add_item(
-                            discord.ui.Button(
-                                label="🕹️ Ouvrir le salon privé",
-                                style=discord.ButtonStyle.link,
-                                url=url
-                            )
-                        )
-                view_invite = OpenChannelView(channel_url)
-                notice = await ctx.send(
-                    f"{ctx.author.mention}, votre salon privé est prêt :",
-                    view=view_invite
-                )
-                asyncio.create_task(self.delete_message_after(notice, 10))
-
-                await game_channel.send(f"{ctx.author.mention}, bienvenue dans votre salon ! Laissez vos tentatives ici.")
-
-                # BOUCLE PRINCIPALE DU JEU
-                while True:
-                    # 1. Sélection du personnage
-                    def choose_new_character():
-                        perso = random.choice(self.personnages)
-                        p_prenom = perso.get("prenom", "").strip()
-                        p_nom = perso.get("nom", "").strip()
-                        p_anime = perso.get("title", "Inconnu").strip()
-                        p_image = perso.get("image", None)
-                        p_full = f"{p_prenom} {p_nom}".strip()
-                        p_valids = {p_prenom.lower(), p_nom.lower(), p_full.lower()}
-                        return {
-                            "prenom": p_prenom,
-                            "nom": p_nom,
-                            "anime": p_anime,
-                            "image": p_image,
-                            "full_name": p_full,
-                            "valids": p_valids
-                        }
-
-                    char_data = choose_new_character()
-                    prenom = char_data["prenom"]
-                    nom = char_data["nom"]
-                    anime = char_data["anime"]
-                    image_url = char_data["image"]
-                    full_name = char_data["full_name"]
-                    noms_valides = char_data["valids"]
-
-                    attempts = 0
-                    max_attempts = 10
-                    found = False
-                    abandoned = False
-                    hint_level = 0
-                    inactivity_task = None
-
-                    async def schedule_inactivity_deletion():
-                        await asyncio.sleep(15 * 60)
-                        try:
-                            await game_channel.delete()
-                        except:
-                            pass
-                    def reset_inactivity_timer():
-                        nonlocal inactivity_task
-                        if inactivity_task and not inactivity_task.done():
-                            inactivity_task.cancel()
-                        inactivity_task = asyncio.create_task(schedule_inactivity_deletion())
-
-                    reset_inactivity_timer()
-
-                    timeout_task = None
-                    wait_message_task = None
-
-                    async def single_timeout():
-                        nonlocal attempts, abandoned, found, timeout_task
-                        try:
-                            await asyncio.sleep(180)
-                            if not found and not abandoned:
-                                abandoned = True
-                                timeout_embed = discord.Embed(
-                                    title="⏲️ Temps écoulé !",
-                                    description=(f"Le temps de 3 minutes sans interaction est écoulé.\n"
-                                                 f"La réponse était **{full_name}** de *{anime}*."),
-                                    color=0xe67e22
-                                )
-                                if image_url:
-                                    timeout_embed.set_thumbnail(url=image_url)
-                                timeout_embed.add_field(name="Tentatives utilisées", value=str(attempts), inline=True)
-                                view_end = EndGameView()
-                                end_msg = await game_channel.send(embed=timeout_embed, view=view_end)
-                                try:
-                                    if view_skip.main_embed_msg:
-                                        await view_skip.main_embed_msg.delete()
-                                except:
-                                    pass
-                                if wait_message_task and not wait_message_task.done():
-                                    wait_message_task.cancel()
-                        except asyncio.CancelledError:
-                            return
-
-                    timeout_task = asyncio.create_task(single_timeout())
-
-                    class EndGameView(discord.ui.View):
-                        def __init__(self):
-                            super().__init__(timeout=None)
-                            self.add_item(
-                                discord.ui.Button(
-                                    label="🔄 Rejouer",
-                                    style=discord.ButtonStyle.primary,
-                                    custom_id="replay_game"
-                                )
-                            )
-
-                    class SkipView(discord.ui.View):
-                        def __init__(self):
-                            super().__init__(timeout=None)
-                            self.main_embed_msg = None
-
-                        def build_hint_embed(self, level: int, remaining: int) -> discord.Embed:
-                            if level == 1:
-                                première_lettre = prenom[0] if prenom else ""
-                                desc = (
-                                    f"**Anime :** {anime}\n\n"
-                                    f"**Indice n°1 –** Le prénom commence par **{première_lettre}…**"
-                                )
-                            elif level == 2:
-                                moitié_prenom = prenom[: len(prenom)//2] if prenom else ""
-                                deux_nom = nom[:2] if len(nom) >= 2 else nom
-                                desc = (
-                                    f"**Anime :** {anime}\n\n"
-                                    f"**Indice n°2 –** La moitié du prénom est **{moitié_prenom}…**\n"
-                                    f"Les 2 premières lettres du nom de famille sont **{deux_nom}…**"
-                                )
-                            else:
-                                trois_quarts = prenom[: (len(prenom)*3)//4] if prenom else ""
-                                moitié_nom = nom[: len(nom)//2] if nom else ""
-                                desc = (
-                                    f"**Anime :** {anime}\n\n"
-                                    f"**Indice n°3 –** Les 3/4 du prénom sont **{trois_quarts}…**\n"
-                                    f"Et la moitié du nom de famille est **{moitié_nom}…**"
-                                )
-                            embed = discord.Embed(title="💡 Indice", description=desc, color=0xf1c40f)
-                            embed.add_field(name="Tentatives restantes", value=str(remaining), inline=False)
-                            if image_url:
-                                embed.set_image(url=image_url)
-                            return embed
-
-                        @discord.ui.button(label="Skip ➡️", style=discord.ButtonStyle.primary, custom_id="guess_skip_button")
-                        async def skip_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-                            nonlocal hint_level, attempts, abandoned, timeout_task
-                            reset_inactivity_timer()
-                            timeout_task.cancel()
-                            timeout_task = asyncio.create_task(single_timeout())
-                            if found or abandoned:
-                                await interaction.response.defer()
-                                return
-                            if hint_level == 3:
-                                button.disabled = True
-                                await interaction.response.edit_message(view=self)
-                                return
-                            if hint_level == 2:
-                                attempts = 9
-                                hint_level = 3
-                                new_embed = self.build_hint_embed(3, remaining=1)
-                                button.disabled = True
-                                await interaction.response.edit_message(embed=new_embed, view=self)
-                                return
-                            if hint_level == 0:
-                                attempts = 4
-                                hint_level = 1
-                            elif hint_level == 1:
-                                attempts = 6
-                                hint_level = 2
-                            restantes = max_attempts - attempts
-                            emb = self.build_hint_embed(hint_level, restantes)
-                            if hint_level == 3:
-                                button.disabled = True
-                            await interaction.response.edit_message(embed=emb, view=self)
-
-                        @discord.ui.button(label="Changer 🔄", style=discord.ButtonStyle.secondary, custom_id="guess_change_button")
-                        async def change_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-                            nonlocal prenom, nom, anime, image_url, full_name, noms_valides
-                            nonlocal attempts, hint_level, found, abandoned, timeout_task
-                            reset_inactivity_timer()
-                            timeout_task.cancel()
-                            timeout_task = asyncio.create_task(single_timeout())
-                            if found or abandoned:
-                                await interaction.response.defer()
-                                return
-                            new_data = choose_new_character()
-                            prenom = new_data["prenom"]
-                            nom = new_data["nom"]
-                            anime = new_data["anime"]
-                            image_url = new_data["image"]
-                            full_name = new_data["full_name"]
-                            noms_valides = new_data["valids"]
-                            attempts = 0
-                            hint_level = 0
-                            found = False
-                            abandoned = False
-                            start_embed = discord.Embed(
-                                title="🎲 Guess the Anime Character",
-                                description=(
-                                    "Devinez ce personnage. Si vous êtes bloqué·e, cliquez sur **Skip ➡️** pour un indice, "
-                                    "**Changer 🔄** pour un autre personnage, ou **Abandonner 🛑** pour renoncer."
-                                ),
-                                color=0x3498db
-                            )
-                            start_embed.add_field(name="Tentatives restantes", value=str(max_attempts), inline=False)
-                            if image_url:
-                                start_embed.set_image(url=image_url)
-                            button.disabled = False
-                            view_skip.children[0].disabled = False
-                            view_skip.children[1].disabled = False
-                            view_skip.children[2].disabled = False
-                            await interaction.response.edit_message(embed=start_embed, view=self)
-
-                        @discord.ui.button(label="Abandonner 🛑", style=discord.ButtonStyle.danger, custom_id="guess_abandon_button")
-                        async def abandon_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-                            nonlocal abandoned, timeout_task, wait_message_task
-                            reset_inactivity_timer()
-                            timeout_task.cancel()
-                            if abandoned:
-                                await interaction.response.defer()
-                                return
-                            abandoned = True
-                            if wait_message_task and not wait_message_task.done():
-                                wait_message_task.cancel()
-                            await interaction.response.defer()
-
-                    view_skip = SkipView()
-                    view_end = EndGameView()
-                    start_embed = discord.Embed(
-                        title="🎲 Guess the Anime Character",
-                        description=(
-                            "Devinez ce personnage. Si vous êtes bloqué·e, cliquez sur **Skip ➡️** pour un indice, "
-                            "**Changer 🔄** pour un autre personnage, ou **Abandonner 🛑** pour renoncer."
-                        ),
-                        color=0x3498db
-                    )
-                    start_embed.add_field(name="Tentatives restantes", value=str(max_attempts), inline=False)
-                    if image_url:
-                        start_embed.set_image(url=image_url)
-                    initial_msg = await game_channel.send(embed=start_embed, view=view_skip)
-                    view_skip.main_embed_msg = initial_msg
-
-                    def check_msg(m: discord.Message):
-                        return m.channel == game_channel and m.author.id == ctx.author.id and not m.author.bot
-
-                    # ---- JEU (phase des tentatives) ----
-                    while attempts < max_attempts and not abandoned and not found:
-                        try:
-                            wait_message_task = asyncio.create_task(self.bot.wait_for("message", check=check_msg))
-                            user_msg = await wait_message_task
-                            reset_inactivity_timer()
-                            timeout_task.cancel()
-                            timeout_task = asyncio.create_task(single_timeout())
-                            if user_msg.content.strip().lower() == "!guess":
-                                asyncio.create_task(self.delete_message_after(user_msg, 0))
-                                continue
-                            asyncio.create_task(self.delete_message_after(user_msg, 0))
-                            contenu = user_msg.content.lower().strip()
-                            if contenu in noms_valides:
-                                found = True
-                                attempts += 1
-                                rest = max_attempts - attempts
-
-                                # ==== AJOUT DU SCORE AU CLASSEMENT ! ====
-                                try:
-                                    classement_cog = self.bot.get_cog("Classement")
-                                    if classement_cog:
-                                        classement_cog.add_guess_win(ctx.author.id)
-                                except Exception as e:
-                                    logger.error(f"Erreur en ajoutant le score guess au classement: {e}")
-
-                                success_embed = discord.Embed(
-                                    title="✅ Bravo !",
-                                    description=f"{user_msg.author.mention}, c’était bien **{full_name}** de *{anime}* !",
-                                    color=0x2ecc71
-                                )
-                                success_embed.set_thumbnail(url=image_url or "")
-                                success_embed.add_field(name="Tentatives utilisées", value=str(attempts), inline=True)
-                                success_embed.add_field(name="Tentatives restantes", value=str(rest), inline=True)
-                                timeout_task.cancel()
-                                end_msg = await game_channel.send(embed=success_embed, view=view_end)
-                                try:
-                                    view_skip.children[0].disabled = True
-                                    view_skip.children[1].disabled = True
-                                    view_skip.children[2].disabled = True
-                                    await view_skip.main_embed_msg.edit(view=view_skip)
-                                except:
-                                    pass
-                                await asyncio.sleep(0.1)
-                                try:
-                                    if view_skip.main_embed_msg:
-                                        await view_skip.main_embed_msg.delete()
-                                except:
-                                    pass
-
-                                # --------- Attente bouton "Rejouer" ----------
-                                restart_game = await self.wait_for_replay_button(game_channel, ctx, end_msg)
-                                if restart_game:
-                                    break  # Recommencer une partie (sort du while attempts, re-rentre dans while True)
-                                else:
-                                    # pas de replay, fermeture du salon
-                                    await asyncio.sleep(30)
-                                    try:
-                                        await game_channel.delete()
-                                    except:
-                                        pass
-                                    return
-                            attempts += 1
-                            rest = max_attempts - attempts
-                            if hint_level > 0:
-                                emb = view_skip.build_hint_embed(hint_level, rest)
-                                await view_skip.main_embed_msg.edit(embed=emb, view=view_skip)
-                            else:
-                                basic_embed = discord.Embed(
-                                    title="🎲 Guess the Anime Character",
-                                    description=(
-                                        "Devinez ce personnage. Si vous êtes bloqué·e, cliquez sur **Skip ➡️** pour un indice, "
-                                        "**Changer 🔄** pour un autre personnage, ou **Abandonner 🛑** pour renoncer."
-                                    ),
-                                    color=0x3498db
-                                )
-                                basic_embed.add_field(name="Tentatives restantes", value=str(rest), inline=False)
-                                if image_url:
-                                    basic_embed.set_image(url=image_url)
-                                await view_skip.main_embed_msg.edit(embed=basic_embed, view=view_skip)
-                            if attempts in (4, 6, 9) and attempts < max_attempts:
-                                if attempts == max_attempts - 1:
-                                    hint_embed = view_skip.build_hint_embed(3, rest)
-                                    await view_skip.main_embed_msg.edit(embed=hint_embed, view=view_skip)
-                                    hint_level = 3
-                                else:
-                                    if attempts == 4:
-                                        hint_level = 1
-                                    else:
-                                        hint_level = 2
-                                    hint_embed = view_skip.build_hint_embed(hint_level, rest)
-                                    await view_skip.main_embed_msg.edit(embed=hint_embed, view=view_skip)
-                        except asyncio.CancelledError:
-                            break
-
-                    timeout_task.cancel()
-
-                    # ----- ABANDON/ECHEC -----
-                    if abandoned and not found:
-                        abandon_embed = discord.Embed(
-                            title="🔚 Partie abandonnée",
-                            description=(f"⚠️ Vous avez cliqué sur **Abandonner**.\n"
-                                         f"La réponse était **{full_name}** de *{anime}*."),
-                            color=0xe67e22
-                        )
-                        if image_url:
-                            abandon_embed.set_thumbnail(url=image_url)
-                        abandon_embed.add_field(name="Tentatives utilisées", value=str(attempts), inline=True)
-                        end_msg = await game_channel.send(embed=abandon_embed, view=view_end)
-                        try:
-                            view_skip.children[0].disabled = True
-                            view_skip.children[1].disabled = True
-                            view_skip.children[2].disabled = True
-                            await view_skip.main_embed_msg.edit(view=view_skip)
-                        except:
-                            pass
-                        restart_game = await self.wait_for_replay_button(game_channel, ctx, end_msg)
-                        if restart_game:
-                            continue
-                        else:
-                            await asyncio.sleep(30)
-                            try:
-                                await game_channel.delete()
-                            except:
-                                pass
-                            return
-
-                    elif not found and not abandoned:
-                        defeat_embed = discord.Embed(
-                            title="🔚 Partie terminée",
-                            description=(f"Aucune tentative restante.\nLa réponse était **{full_name}** de *{anime}*."),
-                            color=0xe67e22
-                        )
-                        defeat_embed.set_thumbnail(url=image_url or "")
-                        defeat_embed.add_field(name="Tentatives utilisées", value=str(max_attempts), inline=True)
-                        end_msg = await game_channel.send(embed=defeat_embed, view=view_end)
-                        try:
-                            view_skip.children[0].disabled = True
-                            view_skip.children[1].disabled = True
-                            view_skip.children[2].disabled = True
-                            await view_skip.main_embed_msg.edit(view=view_skip)
-                        except:
-                            pass
-                        restart_game = await self.wait_for_replay_button(game_channel, ctx, end_msg)
-                        if restart_game:
-                            continue
-                        else:
-                            await asyncio.sleep(30)
-                            try:
-                                await game_channel.delete()
-                            except:
-                                pass
-                            return
-
-                    # Si la partie a été rejouée, on reboucle sur while True
+            pool_key, pool_label = None, None
+            if anime:
+                pool_key, found = self.resolve_pool(catalog, anime)
+                if pool_key is None:
+                    texte = f"⚠️ Série « {anime} » introuvable."
                     if found:
-                        continue
-                    break  # si aucune condition de replay
+                        texte += " Tu voulais dire : " + ", ".join(f"**{t}**" for t in found) + " ?"
+                    err = await ctx.send(texte)
+                    self.delete_message_after(ctx.message, 2)
+                    self.delete_message_after(err, 10)
+                    return
+                pool_label = found
+
+            self.delete_message_after(ctx.message, 2)
+
+            try:
+                game_channel, created = await self.ensure_game_channel(guild, ctx.author)
+            except Exception as e:
+                logger.error(f"[GuessCharacter] Impossible de créer le salon privé pour {ctx.author} : {e}")
+                err = await ctx.send("⚠️ Une erreur est survenue lors de la création du salon privé.")
+                self.delete_message_after(err, 5)
+                return
+            if not created:
+                # Une invocation concurrente a créé le salon entre-temps
+                await self.notify_existing_game(ctx, game_channel)
+                return
+
+            channel_url = f"https://discord.com/channels/{guild.id}/{game_channel.id}"
+            view_invite = OpenChannelView(channel_url)
+            notice = await ctx.send(
+                f"{ctx.author.mention}, votre salon privé est prêt :",
+                view=view_invite
+            )
+            self.delete_message_after(notice, 10)
+
+            bienvenue = f"{ctx.author.mention}, bienvenue dans votre salon ! Laissez vos tentatives ici."
+            if pool_label:
+                bienvenue += f"\nPersonnages tirés uniquement parmi : **{pool_label}**."
+            await game_channel.send(bienvenue)
+
+            # La partie est pilotée par une GameSession : les messages du
+            # salon lui parviennent via on_message, sans boucle ni wait_for.
+            session = GameSession(self, ctx.author, game_channel, catalog, pool_key)
+            self.router.register(game_channel.id, session)
+            await session.start_round()
 
         finally:
             active_guess_ctx.discard(uniq_id)
 
-    async def wait_for_replay_button(self, game_channel, ctx, end_msg):
-        # Fonction utilitaire pour attendre le bouton "Rejouer"
-        def check_interaction(interaction: discord.Interaction):
-            return (
-                interaction.user.id == ctx.author.id
-                and interaction.message.id == end_msg.id
-                and interaction.data.get("custom_id") == "replay_game"
-            )
-        try:
-            interaction = await self.bot.wait_for(
-                "interaction", timeout=30.0, check=check_interaction
-            )
-            if interaction.data.get("custom_id") == "replay_game":
-                await interaction.response.defer()
-                return True
-        except asyncio.TimeoutError:
-            return False
+    @commands.command(
+        name="course",
+        help="(Admin) Lance une course : le premier à trouver le personnage gagne (optionnel : une série).",
+    )
+    @commands.has_role(ADMIN_ROLE_ID)
+    async def race(self, ctx, *, anime: str = None):
+        if ctx.channel.id != GUESS_CHANNEL_ID:
+            self.delete_message_after(ctx.message, 0)
+            err = await ctx.send(f"⚠️ Cette commande n’est disponible que dans le salon <#{GUESS_CHANNEL_ID}>.")
+            self.delete_message_after(err, 5)
+            return
+        if self.router.get(ctx.channel.id) is not None:
+            err = await ctx.send("⚠️ Une course est déjà en cours ici.")
+            self.delete_message_after(err, 5)
+            return
+
+        catalog = self.catalog.snapshot
+        if not catalog.characters:
+            err = await ctx.send("⚠️ Aucun personnage trouvé dans `personnages.json`. Vérifiez le chemin.")
+            self.delete_message_after(err, 5)
+            return
+        pool_key = None
+        if anime:
+            pool_key, found = self.resolve_pool(catalog, anime)
+            if pool_key is None:
+                texte = f"⚠️ Série « {anime} » introuvable."
+                if found:
+                    texte += " Tu voulais dire : " + ", ".join(f"**{t}**" for t in found) + " ?"
+                err = await ctx.send(texte)
+                self.delete_message_after(err, 10)
+                return
+
+        self.delete_message_after(ctx.message, 2)
+        race = RaceSession(self, ctx.channel, self.sampler.draw(RACE_DRAWER, pool_key))
+        self.router.register(ctx.channel.id, race)
+        await race.start()
+
+    @commands.Cog.listener()
+    async def on_message(self, message: discord.Message):
+        if message.author.bot:
+            return
+        session = self.router.get(message.channel.id)
+        if session is not None:
+            await session.handle_message(message)
+
+    @guess_character.autocomplete("anime")
+    async def anime_autocomplete(self, interaction: discord.Interaction, current: str):
+        catalog = self.catalog.snapshot
+        choices = [t for t in catalog.by_type if t.startswith(normalize(current))]
+        choices += catalog.title_index.search(current)
+        # Discord limite un choix à 100 caractères et 25 propositions
+        return [app_commands.Choice(name=c[:100], value=c[:100]) for c in choices[:25]]
 
     async def cog_unload(self):
-        pass
+        self.watch_catalog.cancel()
+        self.refill_pool.cancel()
+        self.save_sessions.cancel()
+        self.save_bags.cancel()
+        # Une écriture plus ancienne encore en cours ne doit pas écraser les dernières
+        results = await asyncio.gather(*self._writes, return_exceptions=True)
+        if any(isinstance(result, Exception) for result in results):
+            self.sampler.dirty = True
+        # Dernier instantané avant l'arrêt, pour reprendre les parties au démarrage
+        try:
+            atomic_write_json(SESSIONS_PATH, self.session_snapshots())
+        except Exception as e:
+            logger.error(f"[GuessCharacter] Erreur sauvegarde des parties : {e}")
+        for session in self.router.handlers():
+            session.dispose()
+        if self.sampler.dirty:
+            try:
+                atomic_write_json(BAGS_PATH, self.sampler.to_dict())
+            except Exception as e:
+                logger.error(f"[GuessCharacter] Erreur sauvegarde des tirages : {e}")
+
+# ---------- Partie ----------
+MAX_ATTEMPTS = 10
+ROUND_TIMEOUT = 180              # 3 min sans interaction : partie terminée
+INACTIVITY_DELETE = 15 * 60      # 15 min sans interaction : salon rendu à la réserve
+REPLAY_WINDOW = 30               # salon libéré 30 s après la fin sans « Rejouer »
+
+class GameSession:
+    """Partie en cours dans un salon privé, sous forme de machine à états.
+
+    PLAYING : un personnage est à deviner ; ENDED : résultat affiché, en
+    attente de « Rejouer » ; CLOSED : salon rendu, plus rien à faire.
+    Les messages arrivent par `handle_message`, les boutons par les
+    méthodes `on_*` appelées depuis les vues.
+
+    `snapshot` / `restore` permettent de reprendre la partie après un
+    redémarrage : l'état tient en quelques champs (indice du personnage,
+    tentatives, indice affiché, échéances en heure murale).
+    """
+
+    PLAYING = "playing"
+    ENDED = "ended"
+    CLOSED = "closed"
+
+    def __init__(self, cog, player, channel, catalog, pool_key=None):
+        self.cog = cog
+        self.player = player
+        self.channel = channel
+        self.catalog = catalog
+        self.pool_key = pool_key
+        self.state = self.ENDED
+        self.perso = None
+        self.perso_index = None
+        self.card = None
+        self.attempts = 0
+        self.hint_level = 0
+        self.view = None
+        self.main_msg = None
+        self.end_msg = None
+        self._timers = {}
+
+    # ----- Reprise -----
+    def snapshot(self):
+        now_wall, now_mono = time.time(), time.monotonic()
+        return {
+            "guild": self.channel.guild.id,
+            "channel": self.channel.id,
+            "player": self.player.id,
+            "pool": self.pool_key,
+            "digest": self.catalog.digest,
+            "perso": self.perso_index,
+            "title": self.perso.title,
+            "name": self.perso.full_name,
+            "attempts": self.attempts,
+            "hint": self.hint_level,
+            "state": self.state,
+            "main": self.main_msg.id if self.main_msg else None,
+            "end": self.end_msg.id if self.end_msg else None,
+            "deadlines": {
+                name: round(now_wall + timer.deadline - now_mono, 1)
+                for name, timer in self._timers.items() if timer.active
+            },
+        }
+
+    @classmethod
+    def restore(cls, cog, data):
+        """Partie reconstruite depuis `snapshot`, ou None si elle n'a plus lieu d'être."""
+        guild = cog.bot.get_guild(data["guild"])
+        channel = guild.get_channel_or_thread(data["channel"]) if guild else None
+        if channel is None:
+            return None
+        catalog = cog.catalog.snapshot
+        index = data["perso"]
+        if data["digest"] != catalog.digest:
+            index = catalog.locate(data["title"], data["name"])
+        player = guild.get_member(data["player"])
+        if index is None or player is None or data["state"] not in (cls.PLAYING, cls.ENDED):
+            asyncio.create_task(cog.release_game_channel(channel))
+            return None
+
+        session = cls(cog, player, channel, catalog, data["pool"])
+        session.perso_index = index
+        session.perso = catalog.characters[index]
+        session.card = cog.cards.get(session.perso)
+        session.attempts = data["attempts"]
+        session.hint_level = data["hint"]
+        session.state = data["state"]
+        session.view = SkipView(cog)
+        if session.state == cls.ENDED:
+            session.view.disable_all()
+        elif session.hint_level == 3:
+            session.view.skip_button.disabled = True
+        if data["main"]:
+            session.main_msg = channel.get_partial_message(data["main"])
+        if data["end"]:
+            session.end_msg = channel.get_partial_message(data["end"])
+        now = time.time()
+        for name, deadline in data["deadlines"].items():
+            session._schedule(name, max(deadline - now, 0), session._timer_callback(name))
+        return session
+
+    # ----- Minuteurs -----
+    def _timer_callback(self, name):
+        return self.on_timeout if name == "timeout" else self.close
+
+    def _schedule(self, name, delay, callback):
+        # Report d'une échéance existante sans recréer de tâche
+        timer = self._timers.get(name)
+        if timer is not None:
+            timer.reschedule(delay)
+        else:
+            self._timers[name] = self.cog.bot.timers.schedule(delay, callback)
+
+    def _cancel(self, name):
+        timer = self._timers.pop(name, None)
+        if timer is not None:
+            timer.cancel()
+
+    def touch(self):
+        """Toute interaction repousse la suppression pour inactivité et,
+        en cours de manche, le délai de 3 minutes."""
+        self._schedule("inactivity", INACTIVITY_DELETE, self.close)
+        if self.state == self.PLAYING:
+            self._schedule("timeout", ROUND_TIMEOUT, self.on_timeout)
+        self.cog.sessions_dirty = True
+
+    # ----- Embeds -----
+    def start_embed(self, remaining):
+        return self.card.start_embed(remaining)
+
+    def hint_embed(self, level, remaining):
+        return self.card.hint_embed(level, remaining)
+
+    def end_embed(self, kind):
+        return self.card.end_embed(kind, self.attempts, MAX_ATTEMPTS - self.attempts, self.player.mention)
+
+    # ----- Déroulé -----
+    def draw(self):
+        self.perso_index = self.cog.sampler.draw_index(self.player.id, self.pool_key, self.catalog)
+        self.perso = self.catalog.characters[self.perso_index]
+        self.card = self.cog.cards.get(self.perso)
+
+    async def start_round(self):
+        self.draw()
+        self.attempts = 0
+        self.hint_level = 0
+        self.end_msg = None
+        self.state = self.PLAYING
+        self._cancel("close")
+        self.touch()
+        self.view = SkipView(self.cog)
+        self.main_msg = await self.channel.send(embed=self.start_embed(MAX_ATTEMPTS), view=self.view)
+
+    async def handle_message(self, message: discord.Message):
+        if message.author.id != self.player.id or self.state != self.PLAYING:
+            return
+        self.touch()
+        self.cog.delete_message_after(message, 0)
+        if message.content.strip().lower() == "!guess":
+            return
+
+        contenu = normalize(message.content)
+        if contenu in self.card.answers or is_correct(contenu, self.perso.valids, self.catalog.answers.forms):
+            self.attempts += 1
+            await self.win()
+            return
+
+        self.attempts += 1
+        rest = MAX_ATTEMPTS - self.attempts
+        suggestion = self.catalog.answers.suggest(contenu, exclude=self.perso.valids)
+        if self.hint_level > 0:
+            embed = self.hint_embed(self.hint_level, rest)
+        else:
+            embed = self.start_embed(rest)
+        if suggestion:
+            # Les embeds de la carte sont partagés : on copie avant d'ajouter le pied de page
+            embed = embed.copy()
+            embed.set_footer(text=f"🤔 Tu pensais peut-être à « {suggestion} » ? Ce n'est pas ça !")
+        # Les modifications successives du message principal sont regroupées :
+        # seul l'état final (embed + vue, ou suppression) est envoyé.
+        edits = self.cog.edits
+        edits.edit(self.main_msg, embed=embed, view=self.view)
+        if self.attempts in (4, 6, 9):
+            if self.attempts == MAX_ATTEMPTS - 1:
+                self.hint_level = 3
+            else:
+                self.hint_level = 1 if self.attempts == 4 else 2
+            hint_embed = self.hint_embed(self.hint_level, rest)
+            if suggestion:
+                hint_embed = hint_embed.copy()
+                hint_embed.set_footer(text=embed.footer.text)
+            edits.edit(self.main_msg, embed=hint_embed, view=self.view)
+        if self.attempts >= MAX_ATTEMPTS:
+            await self.finish("defeat")
+
+    async def win(self):
+        self.state = self.ENDED
+        self._cancel("timeout")
+        # ==== AJOUT DU SCORE AU CLASSEMENT ! ====
+        try:
+            classement_cog = self.cog.bot.get_cog("Classement")
+            if classement_cog:
+                classement_cog.add_guess_win(self.player.id)
+        except Exception as e:
+            logger.error(f"Erreur en ajoutant le score guess au classement: {e}")
+        self.cog.sessions_dirty = True
+        self.end_msg = await self.channel.send(embed=self.end_embed("win"), view=EndGameView(self.cog))
+        self.view.disable_all()
+        self.cog.edits.delete(self.main_msg)
+        self._schedule("close", REPLAY_WINDOW, self.close)
+
+    async def finish(self, kind):
+        """Fin de manche sans victoire : « timeout », « abandon » ou « defeat »."""
+        self.state = self.ENDED
+        self._cancel("timeout")
+        self.cog.sessions_dirty = True
+        self.end_msg = await self.channel.send(embed=self.end_embed(kind), view=EndGameView(self.cog))
+        self.view.disable_all()
+        if kind == "timeout":
+            self.cog.edits.delete(self.main_msg)
+        else:
+            self.cog.edits.edit(self.main_msg, view=self.view)
+        self._schedule("close", REPLAY_WINDOW, self.close)
+
+    async def on_timeout(self):
+        if self.state == self.PLAYING:
+            await self.finish("timeout")
+
+    async def close(self):
+        if self.state == self.CLOSED:
+            return
+        self.dispose()
+        await self.cog.release_game_channel(self.channel)
+
+    def dispose(self):
+        """Arrête tous les minuteurs (salon supprimé ou cog déchargé)."""
+        self.state = self.CLOSED
+        self.cog.sessions_dirty = True
+        for name in list(self._timers):
+            self._cancel(name)
+
+    # ----- Boutons -----
+    async def on_skip(self, interaction: discord.Interaction):
+        button = self.view.skip_button
+        self.touch()
+        if self.state != self.PLAYING:
+            await interaction.response.defer()
+            return
+        # La réponse à l'interaction porte l'état à jour : l'édition en attente est périmée
+        self.cog.edits.discard(self.main_msg)
+        if self.hint_level == 3:
+            button.disabled = True
+            await interaction.response.edit_message(view=self.view)
+            return
+        if self.hint_level == 2:
+            self.attempts = 9
+            self.hint_level = 3
+            button.disabled = True
+            await interaction.response.edit_message(embed=self.hint_embed(3, remaining=1), view=self.view)
+            return
+        if self.hint_level == 0:
+            self.attempts = 4
+            self.hint_level = 1
+        else:
+            self.attempts = 6
+            self.hint_level = 2
+        embed = self.hint_embed(self.hint_level, MAX_ATTEMPTS - self.attempts)
+        await interaction.response.edit_message(embed=embed, view=self.view)
+
+    async def on_change(self, interaction: discord.Interaction):
+        self.touch()
+        if self.state != self.PLAYING:
+            await interaction.response.defer()
+            return
+        self.cog.edits.discard(self.main_msg)
+        self.draw()
+        self.attempts = 0
+        self.hint_level = 0
+        for child in self.view.children:
+            child.disabled = False
+        await interaction.response.edit_message(embed=self.start_embed(MAX_ATTEMPTS), view=self.view)
+
+    async def on_abandon(self, interaction: discord.Interaction):
+        self.touch()
+        await interaction.response.defer()
+        if self.state == self.PLAYING:
+            await self.finish("abandon")
+
+    async def on_replay(self, interaction: discord.Interaction):
+        await interaction.response.defer()
+        if (
+            interaction.user.id != self.player.id
+            or self.state != self.ENDED
+            or self.end_msg is None
+            or interaction.message.id != self.end_msg.id
+        ):
+            return
+        self.touch()
+        await self.start_round()
+
+class RaceSession:
+    """Course dans le salon du jeu : un personnage pour tout le monde, le
+    premier à donner la bonne réponse gagne.
+
+    Aucune tâche ni salon par joueur : chaque message coûte une
+    normalisation et une recherche dans l'ensemble de réponses de la carte
+    du personnage (réponse exacte, sans tolérance aux fautes).
+    """
+
+    def __init__(self, cog, channel, perso):
+        self.cog = cog
+        self.channel = channel
+        self.perso = perso
+        self.answers = cog.cards.get(perso).answers
+        self.active = True
+        self._timer = None
+
+    async def start(self):
+        embed = discord.Embed(
+            title="🏁 Course : qui est ce personnage ?",
+            description=f"Le premier à écrire son nom ici gagne ! Vous avez {GUESS_RACE_TIMEOUT} secondes.",
+            color=0x9b59b6
+        )
+        if self.perso.image:
+            embed.set_image(url=self.perso.image)
+        self._timer = self.cog.bot.timers.schedule(GUESS_RACE_TIMEOUT, self.expire)
+        await self.channel.send(embed=embed)
+
+    async def handle_message(self, message: discord.Message):
+        if not self.active or message.content.startswith("!"):
+            return
+        if normalize(message.content) not in self.answers:
+            return
+        # Fin de course avant tout await : les réponses suivantes sont ignorées
+        self.dispose()
+        self.cog.router.unregister(self.channel.id)
+        try:
+            classement_cog = self.cog.bot.get_cog("Classement")
+            if classement_cog:
+                classement_cog.add_guess_win(message.author.id)
+        except Exception as e:
+            logger.error(f"Erreur en ajoutant le score guess au classement: {e}")
+        embed = discord.Embed(
+            title="🏆 Course terminée !",
+            description=f"{message.author.mention} a trouvé en premier : **{self.perso.full_name}** de *{self.perso.title}* !",
+            color=0x2ecc71
+        )
+        if self.perso.image:
+            embed.set_thumbnail(url=self.perso.image)
+        await self.channel.send(embed=embed)
+
+    async def expire(self):
+        if not self.active:
+            return
+        self.dispose()
+        self.cog.router.unregister(self.channel.id)
+        embed = discord.Embed(
+            title="⏲️ Temps écoulé !",
+            description=f"Personne n'a trouvé. C'était **{self.perso.full_name}** de *{self.perso.title}*.",
+            color=0xe67e22
+        )
+        if self.perso.image:
+            embed.set_thumbnail(url=self.perso.image)
+        await self.channel.send(embed=embed)
+
+    def dispose(self):
+        self.active = False
+        if self._timer is not None:
+            self._timer.cancel()
+
+class GameView(discord.ui.View):
+    """Vue persistante : sans état, elle retrouve la partie par le salon."""
+
+    def __init__(self, cog):
+        super().__init__(timeout=None)
+        self.cog = cog
+
+    async def session_for(self, interaction: discord.Interaction):
+        session = self.cog.router.get(interaction.channel_id)
+        if session is None:
+            await interaction.response.send_message("⚠️ Cette partie n'existe plus.", ephemeral=True)
+        return session
+
+class SkipView(GameView):
+    def disable_all(self):
+        for child in self.children:
+            child.disabled = True
+
+    @discord.ui.button(label="Skip ➡️", style=discord.ButtonStyle.primary, custom_id="guess_skip_button")
+    async def skip_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        session = await self.session_for(interaction)
+        if session is not None:
+            await session.on_skip(interaction)
+
+    @discord.ui.button(label="Changer 🔄", style=discord.ButtonStyle.secondary, custom_id="guess_change_button")
+    async def change_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        session = await self.session_for(interaction)
+        if session is not None:
+            await session.on_change(interaction)
+
+    @discord.ui.button(label="Abandonner 🛑", style=discord.ButtonStyle.danger, custom_id="guess_abandon_button")
+    async def abandon_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        session = await self.session_for(interaction)
+        if session is not None:
+            await session.on_abandon(interaction)
+
+class EndGameView(GameView):
+    @discord.ui.button(label="🔄 Rejouer", style=discord.ButtonStyle.primary, custom_id="replay_game")
+    async def replay_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        session = await self.session_for(interaction)
+        if session is not None:
+            await session.on_replay(interaction)
+
+class OpenChannelView(discord.ui.View):
+    def __init__(self, url: str):
+        super().__init__(timeout=None)
+        self.add_item(
+            discord.ui.Button(
+                label="🕹️ Ouvrir le salon privé",
+                style=discord.ButtonStyle.link,
+                url=url
+            )
+        )
 
 async def setup(bot):
     await bot.add_cog(GuessCharacter(bot))
@@ -1,8 +1,8 @@
 import discord
 from discord.ext import commands, tasks
-import asyncio
 
 from config import ADMIN_ROLE_ID, COMMAND_CHANNEL_ID
+from utils.timers import delete_quietly
 
 class HelpCog(commands.Cog):
     def __init__(self, bot):
@@ -37,7 +37,8 @@ class HelpCog(commands.Cog):
         embed.add_field(name="🗑️ `!delanniv`", value="→ Supprime ton anniversaire", inline=False)
         embed.add_field(name="🔮 `!annivs`", value="→ Liste les 20 anniversaires à venir", inline=False)
         embed.add_field(name="📊 `!classement`", value="→ Classement du serveur", inline=False)
-        embed.add_field(name="🎮 `!guess`", value="→ Devine un personnage d’anime", inline=False)
+        embed.add_field(name="🥇 `!rang [catégorie] [@membre]`", value="→ Ta position dans un classement", inline=False)
+        embed.add_field(name="🎮 `!guess [série]`", value="→ Devine un personnage d’anime", inline=False)
         embed.add_field(name="🧹 `!clear`", value="→ Supprime tes propres messages", inline=False)
 
         embed.set_footer(text="Utilise l'une des commandes ci-dessus directement ici 🎉")
@@ -82,15 +83,8 @@ class HelpCog(commands.Cog):
         message = await ctx.send(embed=embed)
 
         if has_admin_role:
-            await asyncio.sleep(180)
-            try:
-                await ctx.message.delete()
-            except discord.Forbidden:
-                pass
-            try:
-                await message.delete()
-            except discord.Forbidden:
-                pass
+            self.bot.timers.schedule(180, delete_quietly, ctx.message)
+            self.bot.timers.schedule(180, delete_quietly, message)
 
     @commands.command(name="helpjeu")
     async def helpjeu_cmd(self, ctx):
@@ -36,3 +36,31 @@ ADMIN_HELP_ROLE_ID = 1374480292030713856
 BIRTHDAY_CHANNEL_ID = 1377990979100999700
 COMMAND_CHANNEL_ID = 1374478832853192755
 
+
+# ── Classement ──
+CLASSEMENT_FLUSH_INTERVAL = 30           # Écriture différée de data/classement.json toutes les 30 s
+CLASSEMENT_FLUSH_THRESHOLD = 500         # ... ou dès que 500 modifications sont en attente
+CLASSEMENT_JOURNAL = True                # Journal append-only des incréments (data/classement.journal)
+CLASSEMENT_COMPACT_INTERVAL = 10 * 60    # En mode journal : compaction dans l'instantané toutes les 10 min
+CLASSEMENT_COMPACT_THRESHOLD = 20000     # ... ou dès 20 000 événements journalisés
+CLASSEMENT_WINDOW_BUCKETS = {            # Nombre de périodes conservées pour les classements glissants
+    "jour": 7,
+    "semaine": 4,
+    "mois": 12,
+}
+CLASSEMENT_NAME_CACHE_SIZE = 5000        # Noms de membres (même partis) gardés en mémoire pour l'affichage
+CLASSEMENT_PRUNE_INTERVAL = 24           # Heures entre deux nettoyages des membres partis
+CLASSEMENT_VOICE_CHECKPOINT = 5 * 60     # Crédit du temps vocal des sessions ouvertes toutes les 5 min
+
+# ── Jeu !guess ──
+GUESS_CATALOG_CHECK_INTERVAL = 60        # Vérifie toutes les 60 s si personnages.json a changé
+GUESS_SERIES_WEIGHTS = {}                # Poids par série (titre -> poids, 1 par défaut), ex. {"Naruto": 2}
+GUESS_POOL_SIZE = 5                      # Salons de partie pré-créés (cachés) dans GAME_CATEGORY_ID
+GUESS_POOL_LOW_WATERMARK = 2             # Réapprovisionnement dès qu'il reste 2 salons libres ou moins
+GUESS_POOL_REFILL_INTERVAL = 60          # Vérification périodique du stock de salons toutes les 60 s
+GUESS_GAME_MODE = "salon"                # "salon" : salon privé (réserve) ; "fil" : fil privé sous GUESS_CHANNEL_ID
+GUESS_EDIT_WINDOW = 0.3                  # Fenêtre (s) de regroupement des modifications des messages de jeu
+GUESS_SESSION_FLUSH_INTERVAL = 10        # Sauvegarde des parties en cours (reprise après redémarrage) toutes les 10 s
+GUESS_RACE_TIMEOUT = 120                 # Durée max d'une course (!course) avant révélation de la réponse
+GUESS_CARD_CACHE_SIZE = 256              # Cartes de jeu compilées (indices, réponses, embeds) gardées en mémoire
+GUESS_BAG_CACHE_SIZE = 512               # Joueurs dont les sacs de tirage restent en mémoire (les autres : graine + curseur)
@@ -0,0 +1,134 @@
+# guess_character/cards.py
+from collections import OrderedDict
+
+import discord
+
+START_DESCRIPTION = (
+    "Devinez ce personnage. Si vous êtes bloqué·e, cliquez sur **Skip ➡️** pour un indice, "
+    "**Changer 🔄** pour un autre personnage, ou **Abandonner 🛑** pour renoncer."
+)
+# Fins de manche : (titre, début du texte avant la réponse, couleur) ;
+# la victoire commence par la mention du joueur, ajoutée à chaque manche
+END_TEMPLATES = {
+    "win": ("✅ Bravo !", ", c’était bien ", 0x2ecc71),
+    "timeout": ("⏲️ Temps écoulé !",
+                "Le temps de 3 minutes sans interaction est écoulé.\nLa réponse était ", 0xe67e22),
+    "abandon": ("🔚 Partie abandonnée",
+                "⚠️ Vous avez cliqué sur **Abandonner**.\nLa réponse était ", 0xe67e22),
+    "lose": ("🔚 Partie terminée", "Aucune tentative restante.\nLa réponse était ", 0xe67e22),
+}
+
+
+def hint_descriptions(perso):
+    """Les trois textes d'indice d'un personnage, du plus vague au plus précis."""
+    prenom, nom, anime = perso.prenom, perso.nom, perso.title
+    première_lettre = prenom[0] if prenom else ""
+    moitié_prenom = prenom[: len(prenom)//2] if prenom else ""
+    deux_nom = nom[:2] if len(nom) >= 2 else nom
+    trois_quarts = prenom[: (len(prenom)*3)//4] if prenom else ""
+    moitié_nom = nom[: len(nom)//2] if nom else ""
+    # Personnage à nom unique : pas de ligne sur un nom de famille vide
+    ligne_nom_2 = f"\nLes 2 premières lettres du nom de famille sont **{deux_nom}…**" if nom else ""
+    ligne_nom_3 = f"\nEt la moitié du nom de famille est **{moitié_nom}…**" if nom else ""
+    return (
+        f"**Anime :** {anime}\n\n"
+        f"**Indice n°1 –** Le prénom commence par **{première_lettre}…**",
+        f"**Anime :** {anime}\n\n"
+        f"**Indice n°2 –** La moitié du prénom est **{moitié_prenom}…**" + ligne_nom_2,
+        f"**Anime :** {anime}\n\n"
+        f"**Indice n°3 –** Les 3/4 du prénom sont **{trois_quarts}…**" + ligne_nom_3,
+    )
+
+
+class GameCard:
+    """Tout ce qu'une manche affiche pour un personnage, calculé une fois.
+
+    Les embeds de départ, d'indice et de fin (hors victoire) ne diffèrent
+    que par leurs compteurs de tentatives : chaque combinaison est
+    construite au premier besoin puis réutilisée. Ils sont partagés entre
+    parties, donc à copier avant toute modification (pied de page de
+    suggestion, par exemple). L'embed de victoire porte la mention du
+    joueur : il est construit à chaque fois depuis son modèle.
+    """
+
+    __slots__ = ("perso", "answers", "answer_text", "hints", "_start", "_hint", "_end", "_embeds")
+
+    def __init__(self, perso):
+        self.perso = perso
+        self.answers = frozenset(perso.valids)
+        self.answer_text = f"**{perso.full_name}** de *{perso.title}*"
+        self.hints = hint_descriptions(perso)
+        image = {"url": perso.image} if perso.image else None
+        self._start = {"type": "rich", "title": "🎲 Guess the Anime Character",
+                       "description": START_DESCRIPTION, "color": 0x3498db}
+        self._hint = [{"type": "rich", "title": "💡 Indice", "description": text, "color": 0xf1c40f}
+                      for text in self.hints]
+        self._end = {
+            kind: {"type": "rich", "title": title, "color": color,
+                   "description": f"{text}{self.answer_text}" + (" !" if kind == "win" else ".")}
+            for kind, (title, text, color) in END_TEMPLATES.items()
+        }
+        if image:
+            self._start["image"] = image
+            for template in self._hint:
+                template["image"] = image
+            for template in self._end.values():
+                template["thumbnail"] = image
+        self._embeds = {}
+
+    def _embed(self, key, template, remaining):
+        embed = self._embeds.get(key)
+        if embed is None:
+            data = dict(template)
+            data["fields"] = [{"name": "Tentatives restantes", "value": str(remaining), "inline": False}]
+            embed = self._embeds[key] = discord.Embed.from_dict(data)
+        return embed
+
+    def start_embed(self, remaining):
+        return self._embed(remaining, self._start, remaining)
+
+    def hint_embed(self, level, remaining):
+        return self._embed((level, remaining), self._hint[level - 1], remaining)
+
+    def end_embed(self, kind, attempts, remaining, mention=""):
+        """Fin de manche ; `kind` est une clé de END_TEMPLATES."""
+        if kind != "win":
+            key = (kind, attempts)
+            embed = self._embeds.get(key)
+            if embed is None:
+                data = dict(self._end[kind])
+                data["fields"] = [{"name": "Tentatives utilisées", "value": str(attempts), "inline": True}]
+                embed = self._embeds[key] = discord.Embed.from_dict(data)
+            return embed
+        data = dict(self._end[kind])
+        data["description"] = mention + data["description"]
+        data["fields"] = [
+            {"name": "Tentatives utilisées", "value": str(attempts), "inline": True},
+            {"name": "Tentatives restantes", "value": str(remaining), "inline": True},
+        ]
+        return discord.Embed.from_dict(data)
+
+
+class CardCache:
+    """LRU des cartes compilées, indexé par fiche Character."""
+
+    def __init__(self, capacity=256):
+        self.capacity = capacity
+        self._cards = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._cards)
+
+    def get(self, perso):
+        card = self._cards.get(perso)
+        if card is not None:
+            self._cards.move_to_end(perso)
+            self.hits += 1
+            return card
+        self.misses += 1
+        card = self._cards[perso] = GameCard(perso)
+        if len(self._cards) > self.capacity:
+            self._cards.popitem(last=False)
+        return card
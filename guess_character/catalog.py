@@ -0,0 +1,175 @@
+# guess_character/catalog.py
+
+import asyncio
+import hashlib
+import json
+import os
+import sys
+
+from guess_character import compiled
+from guess_character.matching import AnswerIndex, answer_forms, normalize
+from guess_character.prefix import PrefixIndex
+from utils.logger import logger
+
+
+class Character:
+    """Fiche compacte d'un personnage.
+
+    Titres et types sont internés (une seule chaîne partagée par série),
+    l'URL de l'image est découpée en un préfixe interné (dossier CDN) et
+    un suffixe propre au personnage, et les réponses acceptées sont
+    calculées une fois pour toutes (`valids`, formes normalisées).
+    """
+
+    __slots__ = ("prenom", "nom", "title", "type", "valids", "_image_prefix", "_image_suffix")
+
+    def __init__(self, prenom, nom, title, type_, image, valids=None):
+        self.prenom = prenom
+        self.nom = nom
+        self.title = sys.intern(title)
+        self.type = sys.intern(type_)
+        # Quatre réponses au plus : un tuple coûte bien moins qu'un set
+        self.valids = valids if valids is not None else answer_forms(prenom, nom)
+        if image:
+            cut = image.rfind("/") + 1
+            self._image_prefix = sys.intern(image[:cut])
+            self._image_suffix = image[cut:]
+        else:
+            self._image_prefix = None
+            self._image_suffix = None
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            data.get("prenom", "").strip(),
+            data.get("nom", "").strip(),
+            data.get("title", "Inconnu").strip(),
+            data.get("type", "").strip(),
+            data.get("image", None),
+        )
+
+    @property
+    def full_name(self):
+        return f"{self.prenom} {self.nom}".strip()
+
+    @property
+    def image(self):
+        if self._image_prefix is None:
+            return None
+        return self._image_prefix + self._image_suffix
+
+
+class CatalogSnapshot:
+    """Version figée du catalogue, jamais modifiée après construction.
+
+    Une partie garde la référence de l'instantané avec lequel elle a
+    démarré : un rechargement remplace `CharacterCatalog.snapshot` d'un
+    bloc sans rien changer sous ses pieds.
+
+    Les personnages sont triés par (type, titre) : chaque type et chaque
+    série occupe une plage contiguë, et `by_type` / `by_title` associent
+    directement un nom à son `range` d'indices.
+    """
+
+    def __init__(self, characters=(), digest=None):
+        records = [perso if isinstance(perso, Character) else Character.from_dict(perso) for perso in characters]
+        # Tri stable : l'ordre du fichier est conservé dans chaque série
+        records.sort(key=lambda perso: (perso.type, perso.title))
+        self.characters = records
+        self.digest = digest
+        self.by_title = self._ranges(lambda perso: perso.title)
+        self.by_type = self._ranges(lambda perso: perso.type)
+        self.titles = {normalize(title): title for title in self.by_title}
+        # Autocomplétion : les séries les plus fournies d'abord
+        self.title_index = PrefixIndex(
+            (title, title) for title in sorted(self.by_title, key=lambda t: -len(self.by_title[t]))
+        )
+        self.answers = AnswerIndex(self.characters)
+
+    def _ranges(self, key):
+        positions = {}
+        for i, perso in enumerate(self.characters):
+            positions.setdefault(key(perso), []).append(i)
+        return {
+            name: range(idx[0], idx[-1] + 1) if idx[-1] - idx[0] + 1 == len(idx) else idx
+            for name, idx in positions.items()
+        }
+
+    def __len__(self):
+        return len(self.characters)
+
+    def locate(self, title, full_name):
+        """Position d'un personnage d'après sa série et son nom, sinon None."""
+        for i in self.by_title.get(title, ()):
+            if self.characters[i].full_name == full_name:
+                return i
+        return None
+
+
+class CharacterCatalog:
+    """Catalogue de personnages chargé une fois, hors de la boucle d'événements.
+
+    `reload()` ne relit le JSON que si sa date de modification a changé, et
+    ne reconstruit les index que si son contenu (empreinte SHA-256) a changé.
+    Si une version compilée à jour existe à côté (`personnages.bin`, voir
+    tools/compile_catalog.py), elle est lue à la place du JSON.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.compiled_path = os.path.splitext(path)[0] + ".bin"
+        self.snapshot = CatalogSnapshot()
+        self.mtime = None
+        self._lock = asyncio.Lock()
+
+    async def reload(self, force=False):
+        """Recharge si nécessaire ; renvoie True si le catalogue a changé."""
+        async with self._lock:
+            try:
+                mtime = os.stat(self.path).st_mtime
+                if os.path.exists(self.compiled_path):
+                    mtime = max(mtime, os.stat(self.compiled_path).st_mtime)
+            except OSError as e:
+                logger.error(f"[Catalogue] Fichier introuvable : {e}")
+                return False
+            if not force and mtime == self.mtime:
+                return False
+            try:
+                snapshot = await asyncio.to_thread(self._read, force)
+            except Exception as e:
+                logger.error(f"[Catalogue] Erreur lors du chargement : {e}")
+                return False
+            self.mtime = mtime
+            if snapshot is None:
+                # Fichier touché mais contenu identique
+                return False
+            self.snapshot = snapshot
+            logger.info(f"[Catalogue] {len(snapshot)} personnages chargés depuis {self.path}")
+            return True
+
+    def _read(self, force):
+        with open(self.path, "rb") as f:
+            raw = f.read()
+        source = hashlib.sha256(raw)
+        records = self._read_compiled(source.digest())
+        if records is not None:
+            digest, records = records
+            characters = [Character(*record) for record in records]
+        else:
+            digest = source.hexdigest()
+            characters = None
+        if not force and digest == self.snapshot.digest:
+            return None
+        if characters is None:
+            characters = json.loads(raw.decode("utf-8"))
+        return CatalogSnapshot(characters, digest)
+
+    def _read_compiled(self, source_digest):
+        if not os.path.exists(self.compiled_path):
+            return None
+        try:
+            with open(self.compiled_path, "rb") as f:
+                return compiled.load(f.read(), source_digest)
+        except Exception as e:
+            logger.warning(f"[Catalogue] {self.compiled_path} ignoré ({e}), lecture du JSON")
+            return None
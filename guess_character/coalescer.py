@@ -0,0 +1,68 @@
+# guess_character/coalescer.py
+import asyncio
+
+from utils.keyed_lock import KeyedLock
+
+DELETE = object()
+
+
+class EditCoalescer:
+    """Regroupe les modifications successives d'un même message.
+
+    Pendant `window` secondes, les appels à `edit` fusionnent leurs champs
+    (le dernier embed/vue l'emporte) et `delete` remplace tout le reste :
+    seul l'état final part vers Discord, en une requête.
+    """
+
+    def __init__(self, window):
+        self.window = window
+        self._pending = {}         # message.id -> [message, champs ou DELETE]
+        self._locks = KeyedLock()
+        self.requested = 0
+        self.sent = 0
+
+    def __len__(self):
+        return len(self._pending)
+
+    def _entry(self, message):
+        self.requested += 1
+        entry = self._pending.get(message.id)
+        if entry is None:
+            entry = self._pending[message.id] = [message, {}]
+            asyncio.get_running_loop().call_later(
+                self.window, lambda: asyncio.ensure_future(self.flush(message.id))
+            )
+        return entry
+
+    def edit(self, message, **changes):
+        entry = self._entry(message)
+        if entry[1] is not DELETE:
+            entry[1].update(changes)
+
+    def delete(self, message):
+        self._entry(message)[1] = DELETE
+
+    def discard(self, message):
+        """Oublie l'état en attente (le message vient d'être modifié autrement)."""
+        self._pending.pop(message.id, None)
+
+    async def flush(self, message_id):
+        # Un envoi à la fois par message, pour que l'ordre soit respecté
+        async with self._locks(message_id):
+            entry = self._pending.pop(message_id, None)
+            if entry is None:
+                return
+            message, state = entry
+            self.sent += 1
+            try:
+                if state is DELETE:
+                    await message.delete()
+                else:
+                    await message.edit(**state)
+            except Exception:
+                # Message déjà supprimé (salon vidé, fil archivé…)
+                pass
+
+    async def flush_all(self):
+        for message_id in list(self._pending):
+            await self.flush(message_id)
@@ -0,0 +1,123 @@
+# guess_character/compiled.py
+#
+# Format binaire compact du catalogue, produit par tools/compile_catalog.py
+# à partir de personnages.json (qui reste la source éditable).
+#
+#   en-tête  : magic, version, nombre de fiches,
+#              SHA-256 du JSON source, SHA-256 du corps
+#   corps    : table de chaînes UTF-8 séparées par \0 (chaque chaîne une
+#              seule fois), puis 6 index uint32 par fiche (prénom, nom,
+#              série, type, image, réponses normalisées séparées par \t)
+
+import hashlib
+import struct
+import sys
+import unicodedata
+from array import array
+
+from guess_character.matching import answer_forms, normalize
+
+MAGIC = b"GCAT"
+VERSION = 1
+HEADER = struct.Struct("<4sHI32s32s")
+FIELDS = ("prenom", "nom", "title", "type", "image")
+WIDTH = len(FIELDS) + 1    # + réponses précalculées
+TYPES = ("anime", "manga")
+
+
+def clean(text):
+    """Forme canonique d'un champ texte : NFC, espaces superflus retirés."""
+    return " ".join(unicodedata.normalize("NFC", text or "").split())
+
+
+def validate(entries):
+    """Nettoie, valide et dédoublonne les fiches du JSON.
+
+    Renvoie (fiches retenues, erreurs, avertissements) ; les fiches en
+    erreur et les doublons (même nom et même série) sont écartés, la
+    première occurrence l'emporte.
+    """
+    records, errors, warnings = [], [], []
+    seen = {}
+    for position, entry in enumerate(entries):
+        where = f"#{position}"
+        if not isinstance(entry, dict):
+            errors.append(f"{where} : fiche invalide ({type(entry).__name__})")
+            continue
+        record = tuple(clean(entry.get(field)) for field in FIELDS)
+        prenom, nom, title, type_, image = record
+        where = f"#{position} ({f'{prenom} {nom}'.strip()} / {title})"
+        if not prenom and not nom:
+            errors.append(f"{where} : prénom et nom vides")
+            continue
+        if not title:
+            errors.append(f"{where} : série manquante")
+            continue
+        if type_ not in TYPES:
+            errors.append(f"{where} : type « {type_} » inconnu (attendu : {', '.join(TYPES)})")
+            continue
+        if image and not image.startswith("https://"):
+            errors.append(f"{where} : image « {image} » invalide")
+            continue
+        if not prenom:
+            # Nom unique rangé dans le prénom, comme les autres personnages à un seul nom
+            prenom, nom = nom, ""
+            record = (prenom, nom, title, type_, image)
+        key = (normalize(f"{prenom} {nom}"), normalize(title))
+        if key in seen:
+            warnings.append(f"{where} : doublon de la fiche #{seen[key]}, écarté")
+            continue
+        seen[key] = position
+        records.append(record)
+    return records, errors, warnings
+
+
+def dump(records, source_digest):
+    """Sérialise les fiches validées ; `source_digest` est le SHA-256 du JSON."""
+    strings, index = [], {}
+    refs = array("I")
+    for record in records:
+        valids = "\t".join(answer_forms(record[0], record[1]))
+        for value in (*record, valids):
+            if value not in index:
+                index[value] = len(strings)
+                strings.append(value)
+            refs.append(index[value])
+    if sys.byteorder != "little":
+        refs.byteswap()
+    blob = "\0".join(strings).encode("utf-8")
+    body = struct.pack("<I", len(blob)) + blob + refs.tobytes()
+    header = HEADER.pack(MAGIC, VERSION, len(records), source_digest, hashlib.sha256(body).digest())
+    return header + body
+
+
+def load(data, source_digest=None):
+    """Relit un fichier compilé : (empreinte du corps, liste de tuples).
+
+    Chaque tuple suit FIELDS, suivi du tuple des réponses normalisées.
+
+    Lève ValueError si le fichier est corrompu, d'une autre version ou
+    compilé depuis un autre JSON que `source_digest`.
+    """
+    magic, version, count, source, checksum = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("format inconnu")
+    if source_digest is not None and source != source_digest:
+        raise ValueError("compilé depuis une autre version du JSON")
+    body = memoryview(data)[HEADER.size:]
+    if hashlib.sha256(body).digest() != checksum:
+        raise ValueError("somme de contrôle invalide")
+    (blob_len,) = struct.unpack_from("<I", body)
+    strings = bytes(body[4:4 + blob_len]).decode("utf-8").split("\0")
+    refs = array("I")
+    refs.frombytes(body[4 + blob_len:])
+    if sys.byteorder != "little":
+        refs.byteswap()
+    if len(refs) != count * WIDTH:
+        raise ValueError("nombre de fiches incohérent")
+    records = []
+    for start in range(0, len(refs), WIDTH):
+        fields = [strings[i] for i in refs[start:start + WIDTH]]
+        fields[-1] = tuple(fields[-1].split("\t"))
+        records.append(tuple(fields))
+    return checksum.hex(), records
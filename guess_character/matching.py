@@ -0,0 +1,146 @@
+# guess_character/matching.py
+
+import re
+import unicodedata
+from collections import Counter
+
+_NON_ALNUM = re.compile(r"[\W_]+")
+
+
+def normalize(text):
+    """Forme canonique d'une réponse : sans accents, casse ni ponctuation.
+
+    "  Kakashí  HATAKE!" -> "kakashi hatake"
+    """
+    decomposed = unicodedata.normalize("NFKD", text)
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return _NON_ALNUM.sub(" ", stripped.casefold()).strip()
+
+
+def answer_forms(prenom, nom):
+    """Réponses acceptées pour un personnage, déjà normalisées."""
+    prenom, nom = normalize(prenom), normalize(nom)
+    forms = [prenom, nom, f"{prenom} {nom}".strip()]
+    if prenom and nom:
+        # Ordre japonais : nom puis prénom
+        forms.append(f"{nom} {prenom}")
+    return tuple(dict.fromkeys(form for form in forms if form))
+
+
+def tolerance(answer):
+    """Nombre de fautes de frappe tolérées selon la longueur de la réponse."""
+    if len(answer) <= 3:
+        return 0
+    if len(answer) <= 7:
+        return 1
+    return 2
+
+
+def within_distance(a, b, limit):
+    """True si la distance de Levenshtein entre a et b est <= limit.
+
+    Calcul abandonné dès que toute la ligne dépasse la limite.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return False
+    if a == b:
+        return True
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ca != cb),
+            ))
+        if min(current) > limit:
+            return False
+        previous = current
+    return previous[-1] <= limit
+
+
+def distance(a, b):
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
+
+
+def is_correct(guess, valids, taken=()):
+    """`guess` (normalisé) correspond-il à l'une des réponses `valids` ?
+
+    `taken` contient toutes les réponses exactes du catalogue : le nom
+    exact d'un autre personnage n'est jamais pris pour une faute de
+    frappe. La tolérance ne s'applique qu'au nom complet, pas à un
+    prénom ou un nom seul (« mine » n'est pas « Mino »).
+    """
+    if guess in valids:
+        return True
+    if guess in taken:
+        return False
+    full_names = [answer for answer in valids if " " in answer] or valids
+    return any(within_distance(guess, answer, tolerance(answer)) for answer in full_names)
+
+
+def trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class AnswerIndex:
+    """Index de trigrammes sur les noms complets du catalogue.
+
+    Construit une fois par chargement ; sert les suggestions « tu pensais
+    peut-être à… » sans comparer la tentative à chacun des noms.
+    """
+
+    def __init__(self, characters, max_candidates=8):
+        self.max_candidates = max_candidates
+        self.names = []          # nom normalisé
+        self.labels = []         # nom affiché
+        self.postings = {}       # trigramme -> [position dans names]
+        self.forms = set()       # toutes les réponses exactes du catalogue
+        seen = {}
+        for perso in characters:
+            self.forms.update(perso.valids)
+            label = perso.full_name
+            name = normalize(label)
+            if not name or name in seen:
+                continue
+            seen[name] = len(self.names)
+            for gram in trigrams(name):
+                self.postings.setdefault(gram, []).append(len(self.names))
+            self.names.append(name)
+            self.labels.append(label)
+
+    def suggest(self, guess, exclude=()):
+        """Nom affiché le plus proche de `guess`, ou None.
+
+        `exclude` contient les réponses à ne jamais proposer (celles du
+        personnage en cours, pour ne pas donner la solution).
+        """
+        if len(guess) < 3:
+            return None
+        grams = trigrams(guess)
+        hits = Counter()
+        for gram in grams:
+            hits.update(self.postings.get(gram, ()))
+        best, best_distance = None, None
+        for position, shared in hits.most_common(self.max_candidates):
+            # Moins d'un tiers de trigrammes en commun : trop éloigné
+            if shared * 3 < len(grams):
+                break
+            name = self.names[position]
+            if name in exclude:
+                continue
+            d = distance(guess, name)
+            if d == 0:
+                # Nom exact d'un autre personnage : rien à suggérer
+                continue
+            if d <= max(2, len(name) // 3) and (best_distance is None or d < best_distance):
+                best, best_distance = self.labels[position], d
+        return best
@@ -0,0 +1,213 @@
+# guess_character/pool.py
+import math
+import time
+from collections import deque
+
+import discord
+
+from utils.logger import logger
+
+# Marqueur des salons de la réserve, libres ou loués (jamais modifié)
+POOL_TOPIC = "guess:libre"
+POOL_NAME = "guess-partie"
+
+
+class ChannelPool:
+    """Réserve de salons de partie pré-créés et cachés.
+
+    Une partie loue un salon libre en y ajoutant la permission du joueur
+    (un seul appel) au lieu d'un `create_text_channel`, et le rend vidé, avec
+    les permissions de la réserve, au lieu d'un `delete`. La création à
+    froid ne sert plus que quand la réserve est vide.
+
+    Nom et sujet des salons ne changent jamais : Discord n'en autorise que
+    deux modifications par salon toutes les 10 minutes. Le locataire d'un
+    salon est gardé en mémoire et se relit dans ses permissions.
+    """
+
+    def __init__(self, size, low_watermark):
+        self.size = size
+        self.low_watermark = low_watermark
+        self._idle = {}            # guild_id -> deque d'IDs de salons libres
+        self._refilling = set()
+        self._tenants = {}         # channel_id -> user_id du joueur qui l'occupe
+        self._stale = {}           # guild_id -> salons rendus mais pas encore remis en état
+        self.leases = 0
+        self.lease_time = 0.0
+        self.cold_creates = 0
+        self.cold_time = 0.0
+        self.recycled = 0
+        self.rest_calls = 0        # requêtes REST émises (réapprovisionnement compris)
+
+    def idle_count(self, guild):
+        return len(self._idle.get(guild.id, ()))
+
+    def needs_refill(self, guild):
+        return self.idle_count(guild) <= self.low_watermark
+
+    def idle_overwrites(self, guild):
+        return {
+            guild.default_role: discord.PermissionOverwrite(view_channel=False),
+            guild.me: discord.PermissionOverwrite(view_channel=True, send_messages=True, read_messages=True)
+        }
+
+    def player_overwrites(self, guild, member):
+        overwrites = self.idle_overwrites(guild)
+        overwrites[member] = discord.PermissionOverwrite(view_channel=True, send_messages=True, read_messages=True)
+        return overwrites
+
+    def tenant(self, channel):
+        """ID du joueur qui occupe un salon de la réserve, sinon None."""
+        if channel.id in self._tenants:
+            return self._tenants[channel.id]
+        if getattr(channel, "topic", None) != POOL_TOPIC:
+            return None
+        # Après un redémarrage : seul le joueur a une permission individuelle
+        for target in channel.overwrites:
+            if not isinstance(target, discord.Role) and target.id != channel.guild.me.id:
+                return target.id
+        return None
+
+    def adopt(self, category):
+        """Reprend les salons libres restés dans la catégorie (après un redémarrage)."""
+        idle = self._idle.setdefault(category.guild.id, deque())
+        known = set(idle)
+        for channel in category.text_channels:
+            if channel.topic == POOL_TOPIC and channel.id not in known and self.tenant(channel) is None:
+                idle.append(channel.id)
+        return len(idle)
+
+    async def lease(self, guild, member):
+        """Salon libre attribué à `member`, ou None si la réserve est vide."""
+        idle = self._idle.get(guild.id)
+        while idle:
+            channel = guild.get_channel(idle.popleft())
+            if channel is None:
+                continue
+            start = time.perf_counter()
+            self.rest_calls += 1
+            try:
+                self._tenants[channel.id] = member.id
+                await channel.set_permissions(
+                    member,
+                    view_channel=True, send_messages=True, read_messages=True,
+                    reason=f"Salon privé GuessCharacter pour {member}"
+                )
+            except Exception as e:
+                self._tenants.pop(channel.id, None)
+                logger.error(f"[GuessCharacter] Location du salon {channel.id} impossible : {e}")
+                continue
+            self.leases += 1
+            self.lease_time += time.perf_counter() - start
+            return channel
+        return None
+
+    async def create(self, guild, category, member):
+        """Création à froid d'un salon de partie (réserve vide)."""
+        start = time.perf_counter()
+        self.rest_calls += 1
+        channel = await guild.create_text_channel(
+            name=POOL_NAME,
+            category=category,
+            overwrites=self.player_overwrites(guild, member),
+            reason=f"Salon privé GuessCharacter pour {member}",
+            topic=POOL_TOPIC
+        )
+        self._tenants[channel.id] = member.id
+        self.cold_creates += 1
+        self.cold_time += time.perf_counter() - start
+        return channel
+
+    async def release(self, channel):
+        """Vide le salon et le remet en réserve (ou le supprime si elle est pleine)."""
+        guild = channel.guild
+        idle = self._idle.setdefault(guild.id, deque())
+        self._tenants.pop(channel.id, None)
+        if len(idle) >= self.size:
+            self.rest_calls += 1
+            try:
+                await channel.delete()
+            except Exception:
+                pass
+            return False
+        if await self._reset(channel):
+            idle.append(channel.id)
+            self.recycled += 1
+            return True
+        # Remise en état ratée : ni supprimé ni loué, nouvel essai au réapprovisionnement
+        self._stale.setdefault(guild.id, set()).add(channel.id)
+        return False
+
+    async def _reset(self, channel):
+        """Vide le salon et remet les permissions de la réserve ; False en cas d'échec."""
+        guild = channel.guild
+        try:
+            # Une page d'historique et une suppression groupée par tranche de 100
+            deleted = await channel.purge(limit=None)
+            self.rest_calls += len(deleted) // 100 + 1 + math.ceil(len(deleted) / 100)
+            self.rest_calls += 1
+            if channel.topic != POOL_TOPIC:
+                # Salon d'avant la réserve : renommé une seule fois
+                await channel.edit(
+                    name=POOL_NAME,
+                    topic=POOL_TOPIC,
+                    overwrites=self.idle_overwrites(guild),
+                    reason="Retour du salon GuessCharacter dans la réserve"
+                )
+            else:
+                # Permissions seules : hors de la limite nom / sujet de Discord
+                await channel.edit(
+                    overwrites=self.idle_overwrites(guild),
+                    reason="Retour du salon GuessCharacter dans la réserve"
+                )
+        except Exception as e:
+            logger.error(f"[GuessCharacter] Recyclage du salon {channel.id} impossible : {e}")
+            return False
+        return True
+
+    async def refill(self, category):
+        """Complète la réserve : salons à remettre en état d'abord, créations ensuite."""
+        guild = category.guild
+        if guild.id in self._refilling:
+            return 0
+        self._refilling.add(guild.id)
+        created = 0
+        try:
+            idle = self._idle.setdefault(guild.id, deque())
+            stale = self._stale.get(guild.id, set())
+            for channel_id in list(stale):
+                if len(idle) >= self.size:
+                    break
+                channel = guild.get_channel(channel_id)
+                if channel is None:
+                    stale.discard(channel_id)
+                elif await self._reset(channel):
+                    stale.discard(channel_id)
+                    idle.append(channel_id)
+                    self.recycled += 1
+            while len(idle) < self.size:
+                self.rest_calls += 1
+                channel = await guild.create_text_channel(
+                    name=POOL_NAME,
+                    category=category,
+                    overwrites=self.idle_overwrites(guild),
+                    reason="Réserve de salons GuessCharacter",
+                    topic=POOL_TOPIC
+                )
+                idle.append(channel.id)
+                created += 1
+        except Exception as e:
+            logger.error(f"[GuessCharacter] Erreur réapprovisionnement de la réserve : {e}")
+        finally:
+            self._refilling.discard(guild.id)
+        return created
+
+    def forget(self, channel_id):
+        self._tenants.pop(channel_id, None)
+        for stale in self._stale.values():
+            stale.discard(channel_id)
+        for idle in self._idle.values():
+            try:
+                idle.remove(channel_id)
+            except ValueError:
+                pass
@@ -0,0 +1,41 @@
+# guess_character/prefix.py
+
+from bisect import bisect_left
+
+from guess_character.matching import normalize
+
+
+class PrefixIndex:
+    """Index de préfixes pour l'autocomplétion des séries.
+
+    Chaque titre est indexé à partir de chacun de ses mots, pour que
+    "attack" trouve "Shingeki no Kyojin (Attack on Titan)". Ces suffixes
+    normalisés sont rangés dans une liste triée : une recherche est une
+    dichotomie puis le parcours de la plage qui commence par le préfixe.
+    Les résultats suivent l'ordre d'insertion des valeurs.
+    """
+
+    def __init__(self, items=(), limit=25):
+        self.limit = limit
+        self.values = []
+        entries = set()
+        for text, value in items:
+            rank = len(self.values)
+            self.values.append(value)
+            words = normalize(text).split(" ")
+            for start in range(len(words)):
+                entries.add((" ".join(words[start:]), rank))
+        entries = sorted(entries)
+        self._keys = [key for key, _ in entries]
+        self._ranks = [rank for _, rank in entries]
+
+    def search(self, prefix):
+        prefix = normalize(prefix)
+        if not prefix:
+            return self.values[:self.limit]
+        ranks = set()
+        for i in range(bisect_left(self._keys, prefix), len(self._keys)):
+            if not self._keys[i].startswith(prefix):
+                break
+            ranks.add(self._ranks[i])
+        return [self.values[rank] for rank in sorted(ranks)[:self.limit]]
@@ -0,0 +1,39 @@
+# guess_character/registry.py
+
+
+class GameChannelRegistry:
+    """Table joueur <-> salon de partie, tenue à jour par les événements.
+
+    Remplace le parcours de tous les salons de la guilde à chaque !guess :
+    les deux sens de recherche sont en O(1).
+    """
+
+    def __init__(self):
+        self._by_player = {}
+        self._by_channel = {}
+
+    def __len__(self):
+        return len(self._by_player)
+
+    def register(self, user_id, channel_id):
+        old = self._by_player.get(user_id)
+        if old is not None and old != channel_id:
+            self._by_channel.pop(old, None)
+        self._by_player[user_id] = channel_id
+        self._by_channel[channel_id] = user_id
+
+    def unregister_channel(self, channel_id):
+        user_id = self._by_channel.pop(channel_id, None)
+        if user_id is not None and self._by_player.get(user_id) == channel_id:
+            del self._by_player[user_id]
+        return user_id
+
+    def channel_of(self, user_id):
+        return self._by_player.get(user_id)
+
+    def player_of(self, channel_id):
+        return self._by_channel.get(channel_id)
+
+    def clear(self):
+        self._by_player.clear()
+        self._by_channel.clear()
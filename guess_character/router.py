@@ -0,0 +1,29 @@
+# guess_character/router.py
+
+
+class MessageRouter:
+    """Aiguillage des messages vers la partie du salon concerné.
+
+    Un seul listener `on_message` consulte ce dict : le coût par message
+    reste constant quel que soit le nombre de parties en cours, là où
+    chaque `bot.wait_for("message")` ajoutait un prédicat évalué sur
+    tous les messages du bot.
+    """
+
+    def __init__(self):
+        self._routes = {}
+
+    def __len__(self):
+        return len(self._routes)
+
+    def register(self, channel_id, handler):
+        self._routes[channel_id] = handler
+
+    def unregister(self, channel_id):
+        return self._routes.pop(channel_id, None)
+
+    def get(self, channel_id):
+        return self._routes.get(channel_id)
+
+    def handlers(self):
+        return list(self._routes.values())
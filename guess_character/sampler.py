@@ -0,0 +1,179 @@
+# guess_character/sampler.py
+
+import random
+from collections import OrderedDict
+
+ALL = "*"            # clé du sac couvrant tout le catalogue
+TYPE_PREFIX = "type:"  # clé d'un sac limité à un type ("type:anime")
+
+
+class ShuffleBag:
+    """Tirage sans remise sur range(size), O(1) par tirage.
+
+    Fisher-Yates paresseux : seules les cases déjà permutées sont gardées
+    dans `_swaps`. L'état persistant se résume à (seed, cursor) ; à la fin
+    d'un cycle, une nouvelle graine est tirée et tout recommence.
+    """
+
+    __slots__ = ("size", "seed", "cursor", "_rng", "_swaps")
+
+    def __init__(self, size, seed=None, cursor=0):
+        self.size = size
+        self._start(seed if seed is not None else random.getrandbits(32))
+        # Restauration : on rejoue les tirages déjà faits (une seule fois)
+        for _ in range(min(cursor, size)):
+            self.draw()
+
+    def _start(self, seed):
+        self.seed = seed
+        self.cursor = 0
+        self._rng = random.Random(seed)
+        self._swaps = {}
+
+    def draw(self):
+        if self.cursor >= self.size:
+            self._start(self._rng.getrandbits(32))
+        i = self.cursor
+        j = self._rng.randrange(i, self.size)
+        picked = self._swaps.get(j, j)
+        self._swaps[j] = self._swaps.pop(i, i)
+        self.cursor += 1
+        return picked
+
+    def state(self):
+        return [self.seed, self.cursor]
+
+
+class AliasTable:
+    """Tirage pondéré en O(1) (méthode d'alias de Vose)."""
+
+    def __init__(self, keys, weights):
+        self.keys = list(keys)
+        n = len(self.keys)
+        total = float(sum(weights))
+        scaled = [w * n / total for w in weights]
+        self.prob = [0.0] * n
+        self.alias = [0] * n
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+        for i in small + large:
+            self.prob[i] = 1.0
+
+    def draw(self):
+        i = random.randrange(len(self.keys))
+        return self.keys[i] if random.random() < self.prob[i] else self.keys[self.alias[i]]
+
+
+class CharacterSampler:
+    """Sacs de tirage par joueur : aucun personnage ne revient avant que le
+    joueur ait fait le tour du catalogue.
+
+    Avec des poids par série (`weights`, titre -> poids, 1 par défaut), la
+    série est d'abord tirée via une table d'alias (probabilité ∝ taille ×
+    poids), puis le personnage dans le sac de cette série.
+
+    Seuls les sacs des `capacity` joueurs les plus récents restent en
+    mémoire ; ceux des autres sont rangés dans `saved` sous forme
+    (seed, cursor) et reconstruits à leur prochain tirage.
+    """
+
+    def __init__(self, weights=None, capacity=512):
+        self.weights = weights or {}
+        self.capacity = capacity
+        self.snapshot = None
+        self.digest = None
+        self.series = None
+        self.bags = OrderedDict()   # user_id -> {clé de sac: ShuffleBag}, du moins au plus récent
+        self.saved = {}             # user_id -> {clé de sac: (seed, cursor)}, hors mémoire
+        self.dirty = False
+
+    def bind(self, snapshot):
+        """Attache le catalogue courant ; les sacs sont remis à zéro s'il a changé."""
+        self.snapshot = snapshot
+        if self.weights and snapshot.by_title:
+            titles = list(snapshot.by_title)
+            self.series = AliasTable(
+                titles,
+                [len(snapshot.by_title[t]) * self.weights.get(t, 1) for t in titles]
+            )
+        else:
+            self.series = None
+        if snapshot.digest != self.digest:
+            self.digest = snapshot.digest
+            self.bags.clear()
+            self.saved.clear()
+            self.dirty = True
+
+    def pool(self, key, snapshot=None):
+        """Plage d'indices couverte par un sac : tout, un type ou une série."""
+        if snapshot is None:
+            snapshot = self.snapshot
+        if key == ALL:
+            return range(len(snapshot.characters))
+        if key.startswith(TYPE_PREFIX):
+            return snapshot.by_type[key[len(TYPE_PREFIX):]]
+        return snapshot.by_title[key]
+
+    def _bag(self, user_id, key):
+        player = self.bags.get(user_id)
+        if player is None:
+            player = self.bags[user_id] = {}
+            self._evict()
+        else:
+            self.bags.move_to_end(user_id)
+        bag = player.get(key)
+        if bag is None:
+            size = len(self.pool(key))
+            state = self.saved.get(user_id, {}).pop(key, None)
+            bag = ShuffleBag(size, *state) if state else ShuffleBag(size)
+            player[key] = bag
+        return bag
+
+    def _evict(self):
+        """Range les sacs des joueurs les moins récents dans `saved`."""
+        while len(self.bags) > self.capacity:
+            user_id, bags = self.bags.popitem(last=False)
+            self.saved.setdefault(user_id, {}).update(
+                {key: tuple(bag.state()) for key, bag in bags.items()}
+            )
+
+    def draw_index(self, user_id, key=None, snapshot=None):
+        """Position dans `snapshot.characters` du personnage tiré.
+
+        `snapshot` est l'instantané d'une partie en cours (le courant par
+        défaut). S'il a été remplacé depuis par un rechargement, les sacs ne
+        correspondent plus à ses indices : tirage simple dans sa plage.
+        """
+        if snapshot is not None and snapshot.digest != self.digest:
+            pool = self.pool(key or ALL, snapshot)
+            return pool[random.randrange(len(pool))]
+        if key is None:
+            key = self.series.draw() if self.series else ALL
+        pool = self.pool(key)
+        self.dirty = True
+        return pool[self._bag(user_id, key).draw()]
+
+    def draw(self, user_id, key=None):
+        """Tire un personnage ; `key` limite le tirage à un type ou une série."""
+        return self.snapshot.characters[self.draw_index(user_id, key)]
+
+    def to_dict(self):
+        players = {str(uid): dict(bags) for uid, bags in self.saved.items() if bags}
+        for user_id, bags in self.bags.items():
+            players.setdefault(str(user_id), {}).update(
+                {key: bag.state() for key, bag in bags.items()}
+            )
+        return {"digest": self.digest, "players": players}
+
+    def load(self, data):
+        self.digest = data.get("digest")
+        self.saved = {
+            int(uid): {key: tuple(state) for key, state in bags.items()}
+            for uid, bags in data.get("players", {}).items()
+        }
@@ -0,0 +1,117 @@
+# guess_character/transport.py
+import time
+from abc import ABC, abstractmethod
+
+import discord
+
+from utils.logger import logger
+
+
+class GameTransport(ABC):
+    """Support d'une partie : ouvre et libère l'endroit où elle se joue.
+
+    La GameSession ne connaît que l'objet renvoyé par `open` (salon ou fil,
+    tous deux « messageables ») : elle fonctionne à l'identique sur les
+    deux modes. Les compteurs servent à comparer les modes.
+    """
+
+    mode = None
+
+    def __init__(self):
+        self.opens = 0
+        self.open_time = 0.0
+
+    @property
+    @abstractmethod
+    def rest_calls(self):
+        """Requêtes REST émises depuis le démarrage."""
+
+    @abstractmethod
+    def available(self, guild):
+        """Vrai si le mode peut ouvrir des parties sur ce serveur."""
+
+    @abstractmethod
+    async def open(self, guild, member):
+        """Salon ou fil où `member` va jouer."""
+
+    @abstractmethod
+    async def release(self, channel):
+        """Fin de partie : rend le salon ou archive le fil."""
+
+    async def timed_open(self, guild, member):
+        start = time.perf_counter()
+        channel = await self.open(guild, member)
+        self.opens += 1
+        self.open_time += time.perf_counter() - start
+        return channel
+
+
+class ChannelTransport(GameTransport):
+    """Salon privé loué dans la réserve de la catégorie de jeu."""
+
+    mode = "salon"
+
+    def __init__(self, pool, category_id):
+        super().__init__()
+        self.pool = pool
+        self.category_id = category_id
+
+    @property
+    def rest_calls(self):
+        return self.pool.rest_calls
+
+    def category(self, guild):
+        category = guild.get_channel(self.category_id)
+        return category if isinstance(category, discord.CategoryChannel) else None
+
+    def available(self, guild):
+        return self.category(guild) is not None
+
+    async def open(self, guild, member):
+        category = self.category(guild)
+        channel = await self.pool.lease(guild, member)
+        if channel is None:
+            channel = await self.pool.create(guild, category, member)
+        return channel
+
+    async def release(self, channel):
+        await self.pool.release(channel)
+
+
+class ThreadTransport(GameTransport):
+    """Fil privé sous le salon du jeu : rien à supprimer, il est archivé."""
+
+    mode = "fil"
+
+    def __init__(self, parent_id, archive_after=60):
+        super().__init__()
+        self.parent_id = parent_id
+        self.archive_after = archive_after
+        self._rest_calls = 0
+
+    @property
+    def rest_calls(self):
+        return self._rest_calls
+
+    def available(self, guild):
+        return isinstance(guild.get_channel(self.parent_id), discord.TextChannel)
+
+    async def open(self, guild, member):
+        parent = guild.get_channel(self.parent_id)
+        self._rest_calls += 2
+        thread = await parent.create_thread(
+            name=f"guess-{member.name}",
+            type=discord.ChannelType.private_thread,
+            invitable=False,
+            auto_archive_duration=self.archive_after,
+            reason=f"Fil privé GuessCharacter pour {member}"
+        )
+        await thread.add_user(member)
+        return thread
+
+    async def release(self, thread):
+        self._rest_calls += 1
+        try:
+            await thread.edit(archived=True, locked=True)
+        except Exception as e:
+            logger.error(f"[GuessCharacter] Archivage du fil {thread.id} impossible : {e}")
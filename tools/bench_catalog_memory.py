@@ -0,0 +1,71 @@
+# tools/bench_catalog_memory.py
+#
+# Compare la mémoire occupée par le catalogue complet :
+#   - liste de dicts telle que renvoyée par json.load (ancien format)
+#   - fiches Character seules (__slots__, chaînes internées) : c'est la
+#     comparaison qui vaut pour le stockage des fiches
+#   - index construits en plus par CatalogSnapshot, chacun sur sa ligne
+#     (trigrammes des réponses, index des séries et autocomplétion)
+#
+# Usage : python tools/bench_catalog_memory.py
+
+import gc
+import json
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from guess_character.catalog import CatalogSnapshot, Character
+from guess_character.matching import AnswerIndex
+
+JSON_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "guess_character",
+    "data",
+    "personnages.json"
+)
+
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    obj = build()
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return obj, size
+
+
+def main():
+    with open(JSON_PATH, "r", encoding="utf-8") as f:
+        text = f.read()
+    raw = json.loads(text)
+
+    # Ancien format : ce que gardait le cog, plus le dict + set de chaque tirage
+    def old_format():
+        return json.loads(text)
+
+    def records_only():
+        return [Character.from_dict(d) for d in raw]
+
+    def snapshot():
+        return CatalogSnapshot(raw)
+
+    old, old_size = measure(old_format)
+    records, records_size = measure(records_only)
+    _, answers_size = measure(lambda: AnswerIndex(records))
+    _, total_size = measure(snapshot)
+    titles_size = total_size - records_size - answers_size
+    print(f"Personnages            : {len(old)}")
+    print(f"Liste de dicts (json)  : {old_size / 1024:8.1f} Kio")
+    print(f"Fiches Character       : {records_size / 1024:8.1f} Kio "
+          f"(rapport {records_size / old_size:.2f})")
+    print(f"Index des réponses     : {answers_size / 1024:8.1f} Kio (trigrammes, réponses exactes)")
+    print(f"Index des séries       : {titles_size / 1024:8.1f} Kio (plages, autocomplétion)")
+    print(f"CatalogSnapshot total  : {total_size / 1024:8.1f} Kio "
+          f"(rapport {total_size / old_size:.2f})")
+
+if __name__ == "__main__":
+    main()
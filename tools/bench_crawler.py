@@ -0,0 +1,112 @@
+# tools/bench_crawler.py
+#
+# Débit du crawler de catalogue (tools/crawl_catalog.py) contre un serveur
+# HTTP local qui sert des pages « Characters » factices au format MAL,
+# avec ETag et Last-Modified :
+#   - passe 1 : cache vide, toutes les pages sont téléchargées (200)
+#   - passe 2 : cache plein, toutes les pages sont revalidées (304)
+#   - passe 3 : incrémental, seules les nouvelles séries sont demandées
+#
+# Chaque passe vérifie ses compteurs (200 / 304 / erreurs) : le script
+# échoue si le cache ou le mode incrémental ne font pas ce qu'ils doivent.
+#
+# Usage : python tools/bench_crawler.py [--series 200] [--concurrency 8]
+
+import argparse
+import asyncio
+import hashlib
+import os
+import sys
+import tempfile
+
+from aiohttp import web
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.crawl_catalog import crawl
+
+CHARACTERS_PER_PAGE = 25
+LAST_MODIFIED = "Sat, 01 Jun 2024 00:00:00 GMT"
+
+
+def fixture_page(serie_id):
+    rows = []
+    for i in range(CHARACTERS_PER_PAGE):
+        rows.append(
+            "<tr>"
+            f'<td><img data-src="https://cdn.myanimelist.net/r/42x62/images/characters/{serie_id}/{i}.webp?s=abc"></td>'
+            f'<td><a href="https://myanimelist.net/character/{serie_id * 1000 + i}">Nom{i}, Prénom{serie_id}</a></td>'
+            "</tr>"
+        )
+    return f"<html><body><table>{''.join(rows)}</table></body></html>"
+
+
+def make_app(pages):
+    async def characters(request):
+        serie_id = int(request.match_info["serie_id"])
+        body = pages[serie_id]
+        etag = '"' + hashlib.md5(body.encode("utf-8")).hexdigest() + '"'
+        if request.headers.get("If-None-Match") == etag or request.headers.get("If-Modified-Since") == LAST_MODIFIED:
+            return web.Response(status=304, headers={"ETag": etag})
+        return web.Response(
+            text=body, content_type="text/html",
+            headers={"ETag": etag, "Last-Modified": LAST_MODIFIED}
+        )
+
+    app = web.Application()
+    app.router.add_get("/anime/{serie_id}/characters", characters)
+    return app
+
+
+async def run(series_count, concurrency):
+    pages = {i: fixture_page(i) for i in range(series_count + series_count // 10)}
+    runner = web.AppRunner(make_app(pages), access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    def series(ids):
+        return [
+            {"title": f"Série {i}", "type": "anime", "url": f"http://127.0.0.1:{port}/anime/{i}/characters"}
+            for i in ids
+        ]
+
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            print(f"{'Passe':>14} | {'pages':>5} | {'200':>5} | {'304':>5} | {'ajouts':>6} | {'pages/s':>8}")
+            catalog = []
+            first = series(range(series_count))
+            new = series_count // 10
+            # (libellé, séries, refresh, 200 attendus, 304 attendus)
+            passes = (
+                ("cache vide", first, True, series_count, 0),
+                ("revalidation", first, True, 0, series_count),
+                ("incrémental", series(range(series_count + new)), False, new, 0),
+            )
+            for label, todo, refresh, fetched, revalidated in passes:
+                added, crawler, elapsed = await crawl(
+                    todo, catalog, concurrency=concurrency, cache_dir=cache_dir, refresh=refresh
+                )
+                count = crawler.fetched + crawler.revalidated
+                print(f"{label:>14} | {count:>5} | {crawler.fetched:>5} | {crawler.revalidated:>5} | "
+                      f"{added:>6} | {count / elapsed:>8.0f}")
+                assert crawler.errors == 0, (label, crawler.errors)
+                assert crawler.fetched == fetched, (label, crawler.fetched, fetched)
+                assert crawler.revalidated == revalidated, (label, crawler.revalidated, revalidated)
+            expected = len(pages) * CHARACTERS_PER_PAGE
+            assert len(catalog) == expected, (len(catalog), expected)
+    finally:
+        await runner.cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Débit du crawler contre un serveur local")
+    parser.add_argument("--series", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+    asyncio.run(run(args.series, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
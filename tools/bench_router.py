@@ -0,0 +1,82 @@
+# tools/bench_router.py
+#
+# Coût de distribution d'un message selon le nombre de parties en cours :
+#   - ancien schéma : un bot.wait_for("message") par partie, donc un
+#     prédicat évalué pour chaque message reçu (comme Client.dispatch)
+#   - MessageRouter : un seul listener et une recherche dans un dict
+#
+# Usage : python tools/bench_router.py
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from guess_character.router import MessageRouter
+
+MESSAGES = 20000
+GAME_COUNTS = (1, 10, 50, 100, 500)
+
+
+class FakeMessage:
+    __slots__ = ("channel_id", "author_id")
+
+    def __init__(self, channel_id, author_id):
+        self.channel_id = channel_id
+        self.author_id = author_id
+
+
+def make_traffic(games):
+    # La moitié des messages vient de salons hors jeu (discussions du serveur)
+    rng = random.Random(games)
+    traffic = []
+    for _ in range(MESSAGES):
+        if rng.random() < 0.5:
+            traffic.append(FakeMessage(rng.randrange(games), rng.randrange(games)))
+        else:
+            traffic.append(FakeMessage(10**6 + rng.randrange(1000), rng.randrange(10**6)))
+    return traffic
+
+
+def bench_wait_for(games, traffic):
+    # Reproduit la boucle de Client.dispatch sur les listeners "message"
+    listeners = []
+    for i in range(games):
+        listeners.append(lambda m, c=i, a=i: m.channel_id == c and m.author_id == a)
+    hits = 0
+    start = time.perf_counter()
+    for message in traffic:
+        for predicate in listeners:
+            if predicate(message):
+                hits += 1
+    return time.perf_counter() - start, hits
+
+
+def bench_router(games, traffic):
+    router = MessageRouter()
+    for i in range(games):
+        router.register(i, i)
+    hits = 0
+    start = time.perf_counter()
+    for message in traffic:
+        player = router.get(message.channel_id)
+        if player is not None and message.author_id == player:
+            hits += 1
+    return time.perf_counter() - start, hits
+
+
+def main():
+    print(f"{MESSAGES} messages par essai")
+    print(f"{'Parties':>8} | {'wait_for (µs/msg)':>18} | {'router (µs/msg)':>16} | {'gain':>7}")
+    for games in GAME_COUNTS:
+        traffic = make_traffic(games)
+        old, old_hits = bench_wait_for(games, traffic)
+        new, new_hits = bench_router(games, traffic)
+        assert old_hits == new_hits
+        print(f"{games:>8} | {old / MESSAGES * 1e6:>18.3f} | {new / MESSAGES * 1e6:>16.3f} | {old / new:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+# tools/compile_catalog.py
+#
+# Valide, dédoublonne et normalise personnages.json, puis écrit la version
+# compilée personnages.bin (lue en priorité par le cog tant qu'elle
+# correspond au JSON). Le JSON reste la source à éditer.
+#
+# Usage :
+#   python tools/compile_catalog.py            # valide et compile
+#   python tools/compile_catalog.py --check    # valide seulement (code 1 si erreurs)
+#   python tools/compile_catalog.py --bench    # compare chargement JSON / compilé
+#   python tools/compile_catalog.py --json chemin/vers/personnages.json
+
+import argparse
+import hashlib
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from guess_character import compiled
+
+JSON_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "guess_character",
+    "data",
+    "personnages.json"
+)
+
+
+def compile_catalog(json_path, check_only=False):
+    with open(json_path, "rb") as f:
+        raw = f.read()
+    entries = json.loads(raw.decode("utf-8"))
+    records, errors, warnings = compiled.validate(entries)
+
+    for message in errors:
+        print(f"ERREUR  {message}")
+    for message in warnings:
+        print(f"ATTENTION  {message}")
+    print(f"{len(entries)} fiches lues, {len(records)} retenues, "
+          f"{len(errors)} erreurs, {len(warnings)} avertissements")
+    if check_only:
+        return 1 if errors else 0
+
+    data = compiled.dump(records, hashlib.sha256(raw).digest())
+    out_path = os.path.splitext(json_path)[0] + ".bin"
+    tmp_path = out_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, out_path)
+    checksum, _ = compiled.load(data)
+    print(f"{out_path} : {len(data) / 1024:.1f} Kio (JSON : {len(raw) / 1024:.1f} Kio), "
+          f"sha256 {checksum}")
+    return 0
+
+
+def measure(kind, json_path):
+    """Exécuté dans un processus neuf : temps de chargement et RSS ajoutée."""
+    from guess_character.catalog import Character
+
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    if kind == "json":
+        with open(json_path, "rb") as f:
+            entries = json.loads(f.read().decode("utf-8"))
+        parsed = time.perf_counter()
+        characters = [Character.from_dict(d) for d in entries]
+    else:
+        with open(os.path.splitext(json_path)[0] + ".bin", "rb") as f:
+            _, records = compiled.load(f.read())
+        parsed = time.perf_counter()
+        characters = [Character(*record) for record in records]
+    end = time.perf_counter()
+    after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss est en Kio sous Linux
+    print(json.dumps({
+        "count": len(characters),
+        "parse_ms": (parsed - start) * 1000,
+        "ms": (end - start) * 1000,
+        "rss_kib": after - before,
+    }))
+
+
+def bench(json_path, runs=5):
+    if not os.path.exists(os.path.splitext(json_path)[0] + ".bin"):
+        print("Aucun fichier compilé : lancez d'abord la compilation.")
+        return 1
+    print(f"{'Format':>8} | {'fiches':>6} | {'lecture (ms)':>12} | {'+ fiches (ms)':>13} | {'RSS ajoutée (Kio)':>17}")
+    for kind in ("json", "bin"):
+        results = []
+        for _ in range(runs):
+            out = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--measure", kind, "--json", json_path],
+                capture_output=True, text=True, check=True
+            ).stdout
+            results.append(json.loads(out))
+        parse_ms = min(r["parse_ms"] for r in results)
+        total_ms = min(r["ms"] for r in results)
+        rss = min(r["rss_kib"] for r in results)
+        print(f"{kind:>8} | {results[0]['count']:>6} | {parse_ms:>12.1f} | {total_ms:>13.1f} | {rss:>17}")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compilateur du catalogue de personnages")
+    parser.add_argument("--json", default=JSON_PATH, help="chemin de personnages.json")
+    parser.add_argument("--check", action="store_true", help="valider sans écrire")
+    parser.add_argument("--bench", action="store_true", help="comparer les temps de chargement et la RSS")
+    parser.add_argument("--measure", choices=("json", "bin"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        measure(args.measure, args.json)
+        return 0
+    if args.bench:
+        return bench(args.json)
+    return compile_catalog(args.json, check_only=args.check)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
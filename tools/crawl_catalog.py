@@ -0,0 +1,235 @@
+# tools/crawl_catalog.py
+#
+# Construit ou complète personnages.json à partir des pages « Characters »
+# de MyAnimeList pour une liste de séries.
+#
+#   - une seule session aiohttp (connexions réutilisées), concurrence bornée
+#   - cache HTTP sur disque, revalidé par ETag / Last-Modified (304)
+#   - incrémental : seules les séries absentes du catalogue sont récupérées
+#     (--refresh pour tout reprendre)
+#
+# Fichier de séries (JSON) :
+#   [{"title": "Naruto", "type": "anime",
+#     "url": "https://myanimelist.net/anime/20/Naruto/characters"}, ...]
+#
+# Usage :
+#   python tools/crawl_catalog.py series.json
+#   python tools/crawl_catalog.py series.json --concurrency 4 --cache data/crawl_cache
+#
+# Ensuite : python tools/compile_catalog.py pour valider et compiler.
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+
+import aiohttp
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.storage import atomic_write_json
+
+JSON_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "guess_character",
+    "data",
+    "personnages.json"
+)
+CACHE_DIR = "data/crawl_cache"
+USER_AGENT = "Bot_Discord catalog crawler"
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Miniature MAL (/r/42x62/...?s=...) -> image pleine taille
+THUMBNAIL = re.compile(r"/r/\d+x\d+/")
+
+
+class HttpCache:
+    """Cache disque des pages : corps + validateurs (ETag, Last-Modified)."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _paths(self, url):
+        key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        base = os.path.join(self.directory, key)
+        return base + ".json", base + ".html"
+
+    def get(self, url):
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(body_path, "r", encoding="utf-8") as f:
+                return meta, f.read()
+        except (OSError, ValueError):
+            return None, None
+
+    def put(self, url, headers, body):
+        meta_path, body_path = self._paths(url)
+        with open(body_path, "w", encoding="utf-8") as f:
+            f.write(body)
+        meta = {
+            "url": url,
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+        }
+        atomic_write_json(meta_path, meta)
+
+
+class Crawler:
+    """Récupère des pages en parallèle (au plus `concurrency` à la fois)."""
+
+    def __init__(self, session, cache, concurrency=4, delay=0.0, retries=3):
+        self.session = session
+        self.cache = cache
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.delay = delay
+        self.retries = retries
+        self.fetched = 0       # 200 : page téléchargée
+        self.revalidated = 0   # 304 : page du cache confirmée
+        self.errors = 0
+
+    async def fetch(self, url):
+        """Corps HTML de `url` (depuis le cache si le serveur répond 304), sinon None."""
+        meta, cached = self.cache.get(url)
+        headers = {}
+        if meta:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+
+        async with self.semaphore:
+            try:
+                for attempt in range(self.retries):
+                    if attempt:
+                        # Pause croissante avant de réessayer (429, 5xx, réseau)
+                        await asyncio.sleep(2 ** attempt)
+                    try:
+                        async with self.session.get(url, headers=headers) as resp:
+                            if resp.status == 304 and cached is not None:
+                                self.revalidated += 1
+                                return cached
+                            if resp.status == 200:
+                                body = await resp.text()
+                                await asyncio.to_thread(self.cache.put, url, resp.headers, body)
+                                self.fetched += 1
+                                return body
+                            print(f"[Crawler] {url} : HTTP {resp.status}", file=sys.stderr)
+                            if resp.status not in RETRY_STATUSES:
+                                break
+                    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                        print(f"[Crawler] {url} : {e!r}", file=sys.stderr)
+            finally:
+                if self.delay:
+                    await asyncio.sleep(self.delay)
+        self.errors += 1
+        return cached
+
+
+def full_image(src):
+    if not src:
+        return None
+    return THUMBNAIL.sub("/", src.split("?", 1)[0])
+
+
+def split_name(name):
+    """MAL affiche « Nom, Prénom » ; un nom seul devient le prénom."""
+    if "," in name:
+        nom, prenom = (part.strip() for part in name.split(",", 1))
+        return prenom, nom
+    return name.strip(), ""
+
+
+def parse_characters(html):
+    """(nom affiché, image) de chaque personnage d'une page « Characters »."""
+    soup = BeautifulSoup(html, "html.parser")
+    found = []
+    seen = set()
+    for link in soup.select('a[href*="/character/"]'):
+        name = link.get_text(" ", strip=True)
+        if not name or link["href"] in seen:
+            continue
+        row = link.find_parent("tr")
+        img = row.find("img") if row else None
+        if img is None:
+            continue
+        seen.add(link["href"])
+        found.append((name, full_image(img.get("data-src") or img.get("src"))))
+    return found
+
+
+async def crawl(series, catalog, concurrency=4, cache_dir=CACHE_DIR, refresh=False, delay=0.0):
+    """Ajoute à `catalog` les personnages des séries ; renvoie (ajouts, crawler, durée)."""
+    known = {entry.get("title") for entry in catalog}
+    todo = [s for s in series if refresh or s["title"] not in known]
+    existing = {(e.get("prenom"), e.get("nom"), e.get("title")) for e in catalog}
+
+    connector = aiohttp.TCPConnector(limit=concurrency, ttl_dns_cache=300)
+    timeout = aiohttp.ClientTimeout(total=30)
+    start = time.perf_counter()
+    async with aiohttp.ClientSession(
+        connector=connector, timeout=timeout, headers={"User-Agent": USER_AGENT}
+    ) as session:
+        crawler = Crawler(session, HttpCache(cache_dir), concurrency=concurrency, delay=delay)
+        pages = await asyncio.gather(*(crawler.fetch(s["url"]) for s in todo))
+    elapsed = time.perf_counter() - start
+
+    added = 0
+    for serie, html in zip(todo, pages):
+        if html is None:
+            continue
+        for name, image in parse_characters(html):
+            prenom, nom = split_name(name)
+            key = (prenom, nom, serie["title"])
+            if key in existing:
+                continue
+            existing.add(key)
+            catalog.append({
+                "prenom": prenom,
+                "nom": nom,
+                "image": image,
+                "type": serie["type"],
+                "title": serie["title"],
+            })
+            added += 1
+    return added, crawler, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Crawler du catalogue de personnages")
+    parser.add_argument("series", help="fichier JSON des séries à récupérer")
+    parser.add_argument("--json", default=JSON_PATH, help="catalogue à compléter")
+    parser.add_argument("--cache", default=CACHE_DIR, help="dossier du cache HTTP")
+    parser.add_argument("--concurrency", type=int, default=4, help="requêtes simultanées")
+    parser.add_argument("--delay", type=float, default=1.0, help="pause (s) après chaque requête")
+    parser.add_argument("--refresh", action="store_true", help="reprendre aussi les séries déjà présentes")
+    args = parser.parse_args()
+
+    with open(args.series, "r", encoding="utf-8") as f:
+        series = json.load(f)
+    catalog = []
+    if os.path.exists(args.json):
+        with open(args.json, "r", encoding="utf-8") as f:
+            catalog = json.load(f)
+
+    added, crawler, elapsed = asyncio.run(crawl(
+        series, catalog, args.concurrency, args.cache, args.refresh, args.delay
+    ))
+    pages = crawler.fetched + crawler.revalidated
+    print(f"{pages} pages en {elapsed:.1f} s ({pages / elapsed if elapsed else 0:.1f} pages/s) : "
+          f"{crawler.fetched} téléchargées, {crawler.revalidated} revalidées (304), {crawler.errors} erreurs")
+    print(f"{added} personnages ajoutés")
+    if added:
+        atomic_write_json(args.json, catalog, indent=2, ensure_ascii=False)
+        print(f"{args.json} mis à jour ; pensez à lancer tools/compile_catalog.py")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+# utils/buckets.py
+
+from collections import deque
+
+from utils.ranking import RankedIndex
+
+
+def day_period(dt):
+    return dt.toordinal()
+
+
+def week_period(dt):
+    # Ordinal du lundi de la semaine
+    return dt.toordinal() - dt.weekday()
+
+
+def month_period(dt):
+    return dt.year * 12 + dt.month - 1
+
+
+class BucketRing:
+    """Anneau borné de classements par période (jour, semaine, mois...).
+
+    Le dernier seau correspond à la période courante ; changer de période
+    ajoute un seau vide en O(1) et, une fois `retain` seaux atteints, le
+    plus ancien sort de l'anneau. Ses points restent comptés dans le
+    classement général, alimenté par les mêmes incréments.
+    """
+
+    def __init__(self, period_of, retain):
+        self.period_of = period_of
+        self.buckets = deque(maxlen=max(1, retain))
+
+    def _bucket(self, period, create):
+        if self.buckets and self.buckets[-1][0] == period:
+            return self.buckets[-1][1]
+        if not self.buckets or period > self.buckets[-1][0]:
+            if not create:
+                return None
+            index = RankedIndex()
+            self.buckets.append((period, index))
+            return index
+        # Événement daté d'une période passée (relecture du journal)
+        for bucket_period, index in self.buckets:
+            if bucket_period == period:
+                return index
+        return None
+
+    def add(self, user_id, delta, when):
+        index = self._bucket(self.period_of(when), create=True)
+        if index is not None:
+            index.add(user_id, delta)
+
+    def get(self, when):
+        """Classement de la période contenant `when`, ou None s'il est vide."""
+        return self._bucket(self.period_of(when), create=False)
+
+    def discard(self, user_id):
+        for _, index in self.buckets:
+            index.discard(user_id)
+
+    def to_list(self):
+        return [[period, dict(index.scores)] for period, index in self.buckets]
+
+    def load(self, data):
+        self.buckets.clear()
+        for period, scores in data:
+            self.buckets.append((period, RankedIndex({int(k): v for k, v in scores.items()})))
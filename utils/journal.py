@@ -0,0 +1,126 @@
+# utils/journal.py
+
+import os
+
+from utils.logger import logger
+
+
+class EventJournal:
+    """Journal append-only d'incréments `(seq, type, user_id, valeur, horodatage)`.
+
+    Chaque événement coûte une ligne de quelques octets. La compaction
+    se fait en deux temps : `rotate()` met de côté le segment courant
+    (et renvoie le dernier numéro de séquence qu'il contient), puis,
+    une fois l'instantané écrit, `discard_rotated()` le supprime.
+    Au démarrage, `replay(seq)` relit tout ce qui est postérieur à
+    l'instantané, y compris un segment dont la compaction a échoué.
+
+    Une ligne n'est valide qu'une fois terminée par son saut de ligne :
+    une fin de fichier tronquée par un arrêt brutal est ignorée à la
+    relecture, puis coupée avant d'écrire à nouveau dans le fichier.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.rotated_path = f"{path}.old"
+        self.seq = 0
+        self._file = None
+
+    def open(self, last_seq=0):
+        self.seq = max(self.seq, last_seq)
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        _drop_torn_tail(self.path)
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def append(self, kind, user_id, value, timestamp):
+        self.seq += 1
+        self._file.write(f"{self.seq} {kind} {user_id} {value} {int(timestamp)}\n")
+        # Pousse la ligne vers l'OS : un crash du processus ne perd rien
+        self._file.flush()
+        return self.seq
+
+    def replay(self, after_seq=0):
+        """Renvoie les enregistrements de numéro > `after_seq`, dans l'ordre."""
+        records = []
+        last = 0
+        for path in (self.rotated_path, self.path):
+            if not os.path.exists(path):
+                continue
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    record = _parse(line)
+                    if record is None:
+                        # Dernière ligne tronquée par un arrêt brutal
+                        logger.warning(f"[Journal] Ligne ignorée dans {path} : {line!r}")
+                        continue
+                    seq = record[0]
+                    if seq <= last:
+                        # Déjà lu : copie partielle laissée par une compaction interrompue
+                        continue
+                    last = seq
+                    self.seq = max(self.seq, seq)
+                    if seq > after_seq:
+                        records.append(record)
+        return records
+
+    def rotate(self):
+        """Met le segment courant de côté et en ouvre un nouveau."""
+        self.close()
+        if os.path.exists(self.path):
+            if os.path.exists(self.rotated_path):
+                # Compaction précédente échouée : on concatène les segments
+                _drop_torn_tail(self.rotated_path)
+                with open(self.path, "r", encoding="utf-8") as src, \
+                        open(self.rotated_path, "a", encoding="utf-8") as dst:
+                    dst.write(src.read())
+                os.remove(self.path)
+            else:
+                os.replace(self.path, self.rotated_path)
+        self.open()
+        return self.seq
+
+    def discard_rotated(self):
+        try:
+            os.remove(self.rotated_path)
+        except FileNotFoundError:
+            pass
+
+
+def _parse(line):
+    """(seq, type, user_id, valeur, horodatage), ou None si la ligne est incomplète."""
+    if not line.endswith("\n"):
+        return None
+    parts = line.split()
+    if len(parts) != 5 or not parts[1].isalpha():
+        return None
+    try:
+        return int(parts[0]), parts[1], int(parts[2]), int(parts[3]), int(parts[4])
+    except ValueError:
+        return None
+
+
+def _drop_torn_tail(path, chunk=4096):
+    """Coupe le fichier après son dernier saut de ligne (ligne à moitié écrite)."""
+    try:
+        f = open(path, "rb+")
+    except FileNotFoundError:
+        return
+    with f:
+        size = f.seek(0, os.SEEK_END)
+        end = size
+        while end > 0:
+            start = max(0, end - chunk)
+            f.seek(start)
+            newline = f.read(end - start).rfind(b"\n")
+            if newline != -1:
+                end = start + newline + 1
+                break
+            end = start
+        if end != size:
+            logger.warning(f"[Journal] {size - end} octets tronqués retirés de {path}")
+            f.truncate(end)
@@ -0,0 +1,36 @@
+# utils/keyed_lock.py
+import asyncio
+from contextlib import asynccontextmanager
+
+
+class KeyedLock:
+    """Verrous asyncio par clé, libérés dès que plus personne ne les utilise.
+
+    Chaque entrée compte ses détenteurs et attentes ; elle est retirée quand
+    le compteur retombe à zéro, la mémoire reste donc proportionnelle aux
+    sections critiques en cours et non au nombre de clés vues.
+    """
+
+    def __init__(self):
+        self._locks = {}
+
+    def __len__(self):
+        return len(self._locks)
+
+    def locked(self, key):
+        entry = self._locks.get(key)
+        return entry is not None and entry[0].locked()
+
+    @asynccontextmanager
+    async def __call__(self, key):
+        entry = self._locks.get(key)
+        if entry is None:
+            entry = self._locks[key] = [asyncio.Lock(), 0]
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                yield
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._locks[key]
@@ -0,0 +1,63 @@
+# utils/names.py
+
+from collections import OrderedDict
+
+from utils.logger import logger
+
+UNKNOWN = None  # membre introuvable, mémorisé pour ne pas redemander
+
+
+class NameResolver:
+    """Résout des IDs en noms affichés pour les classements.
+
+    Ordre de recherche : cache membres de la guilde, puis LRU borné de
+    noms déjà vus (y compris de membres partis), puis une seule requête
+    gateway `query_members` pour tous les IDs encore inconnus.
+    """
+
+    def __init__(self, capacity=5000):
+        self.capacity = capacity
+        self._names = OrderedDict()
+        self.gateway_queries = 0
+
+    def remember(self, user_id, name):
+        self._names[user_id] = name
+        self._names.move_to_end(user_id)
+        if len(self._names) > self.capacity:
+            self._names.popitem(last=False)
+
+    def forget(self, user_id):
+        self._names.pop(user_id, None)
+
+    async def resolve(self, guild, user_ids):
+        """Renvoie {user_id: nom} ; les inconnus n'y figurent pas."""
+        names = {}
+        missing = []
+        for user_id in user_ids:
+            member = guild.get_member(user_id)
+            if member is not None:
+                names[user_id] = member.display_name
+                self.remember(user_id, member.display_name)
+            elif user_id in self._names:
+                self._names.move_to_end(user_id)
+                if self._names[user_id] is not UNKNOWN:
+                    names[user_id] = self._names[user_id]
+            else:
+                missing.append(user_id)
+
+        # Une requête gateway par lot de 100 IDs (une seule pour une page)
+        for start in range(0, len(missing), 100):
+            batch = missing[start:start + 100]
+            try:
+                self.gateway_queries += 1
+                members = await guild.query_members(user_ids=batch, limit=len(batch), cache=True)
+            except Exception as e:
+                logger.warning(f"[Noms] Échec de query_members : {e}")
+                continue
+            for member in members:
+                names[member.id] = member.display_name
+                self.remember(member.id, member.display_name)
+            for user_id in batch:
+                if user_id not in names:
+                    self.remember(user_id, UNKNOWN)
+        return names
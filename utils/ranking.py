@@ -0,0 +1,170 @@
+# utils/ranking.py
+
+from itertools import count
+from math import log
+from random import random
+
+_MAX_LEVELS = 24          # suffisant pour ~16 millions d'entrées
+_END = (float("inf"),)    # clé sentinelle, supérieure à toute clé réelle
+_versions = count(1)      # numéros de version uniques, tous index confondus
+
+
+class _Node:
+    __slots__ = ("key", "next", "width")
+
+    def __init__(self, key, level):
+        self.key = key
+        self.next = [None] * level
+        self.width = [1] * level
+
+
+class _SkipList:
+    """Skip list indexable : insertion, suppression, rang et accès par
+    position en O(log n) (espérance), parcours de k éléments en O(k)."""
+
+    def __init__(self):
+        self.size = 0
+        self._nil = _Node(_END, 0)
+        self._head = _Node(None, _MAX_LEVELS)
+        self._head.next = [self._nil] * _MAX_LEVELS
+
+    def _path(self, key):
+        chain = [None] * _MAX_LEVELS
+        steps = [0] * _MAX_LEVELS
+        node = self._head
+        for level in reversed(range(_MAX_LEVELS)):
+            while node.next[level].key < key:
+                steps[level] += node.width[level]
+                node = node.next[level]
+            chain[level] = node
+        return chain, steps
+
+    def insert(self, key):
+        """Insère `key` et renvoie sa position."""
+        chain, steps_at_level = self._path(key)
+        depth = min(_MAX_LEVELS, 1 - int(log(1.0 - random(), 2.0)))
+        new = _Node(key, depth)
+        steps = 0
+        for level in range(depth):
+            prev = chain[level]
+            new.next[level] = prev.next[level]
+            prev.next[level] = new
+            new.width[level] = prev.width[level] - steps
+            prev.width[level] = steps + 1
+            steps += steps_at_level[level]
+        for level in range(depth, _MAX_LEVELS):
+            chain[level].width[level] += 1
+        self.size += 1
+        return sum(steps_at_level)
+
+    def remove(self, key):
+        """Retire `key` et renvoie la position qu'elle occupait."""
+        chain, steps_at_level = self._path(key)
+        target = chain[0].next[0]
+        if target.key != key:
+            raise KeyError(key)
+        depth = len(target.next)
+        for level in range(depth):
+            prev = chain[level]
+            prev.width[level] += target.width[level] - 1
+            prev.next[level] = target.next[level]
+        for level in range(depth, _MAX_LEVELS):
+            chain[level].width[level] -= 1
+        self.size -= 1
+        return sum(steps_at_level)
+
+    def rank(self, key):
+        node = self._head
+        position = 0
+        for level in reversed(range(_MAX_LEVELS)):
+            while node.next[level].key < key:
+                position += node.width[level]
+                node = node.next[level]
+        return position if node.next[0].key == key else None
+
+    def walk(self, start, count):
+        """Renvoie jusqu'à `count` clés à partir de la position `start`."""
+        if start >= self.size or count <= 0:
+            return []
+        node = self._head
+        remaining = start + 1
+        for level in reversed(range(_MAX_LEVELS)):
+            while node.width[level] <= remaining:
+                remaining -= node.width[level]
+                node = node.next[level]
+        keys = []
+        while node is not self._nil and len(keys) < count:
+            keys.append(node.key)
+            node = node.next[0]
+        return keys
+
+
+class RankedIndex:
+    """Classement d'une catégorie maintenu au fil des incréments.
+
+    `scores` (un dict ou Counter existant) reste la source de vérité et
+    est mis à jour en place ; l'index trié l'accompagne pour répondre au
+    top-k et au rang d'un membre sans retrier toute la table. À score
+    égal, le plus petit ID passe devant.
+
+    `version` change uniquement quand les `top_depth` premières places
+    sont modifiées : c'est la clé de cache des embeds déjà rendus.
+    """
+
+    def __init__(self, scores=None, top_depth=10):
+        self.scores = scores if scores is not None else {}
+        self.top_depth = top_depth
+        self.version = next(_versions)
+        self._list = _SkipList()
+        for user_id, score in self.scores.items():
+            if score:
+                self._list.insert((-score, user_id))
+
+    def __len__(self):
+        return self._list.size
+
+    def set(self, user_id, score):
+        old = self.scores.get(user_id, 0)
+        if old == score:
+            return
+        touched = False
+        if old:
+            touched = self._list.remove((-old, user_id)) < self.top_depth
+        if score:
+            touched = self._list.insert((-score, user_id)) < self.top_depth or touched
+            self.scores[user_id] = score
+        else:
+            self.scores.pop(user_id, None)
+        if touched:
+            self.version = next(_versions)
+
+    def add(self, user_id, delta=1):
+        self.set(user_id, self.scores.get(user_id, 0) + delta)
+
+    def discard(self, user_id):
+        self.set(user_id, 0)
+
+    def rank(self, user_id):
+        """Position (0 = premier) du membre, ou None s'il n'est pas classé."""
+        score = self.scores.get(user_id, 0)
+        if not score:
+            return None
+        return self._list.rank((-score, user_id))
+
+    def page(self, start, count):
+        """[(position, user_id, score)] à partir de la position `start`."""
+        return [
+            (start + i, user_id, -neg_score)
+            for i, (neg_score, user_id) in enumerate(self._list.walk(start, count))
+        ]
+
+    def top(self, count):
+        return [(user_id, score) for _, user_id, score in self.page(0, count)]
+
+    def around(self, user_id, radius=2):
+        """Rang du membre et ses voisins directs (au plus `radius` de chaque côté)."""
+        position = self.rank(user_id)
+        if position is None:
+            return None, []
+        start = max(0, position - radius)
+        return position, self.page(start, position - start + radius + 1)
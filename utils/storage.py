@@ -0,0 +1,29 @@
+# utils/storage.py
+
+import json
+import os
+import tempfile
+
+
+def atomic_write_json(path, data, **dump_kwargs):
+    """Écrit `data` dans `path` sans jamais laisser un fichier tronqué.
+
+    Le JSON est d'abord écrit dans un fichier temporaire du même dossier,
+    synchronisé sur le disque, puis renommé par-dessus la cible (os.replace
+    est atomique sur un même système de fichiers).
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", suffix=".json", dir=directory)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, **dump_kwargs)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
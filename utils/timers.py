@@ -0,0 +1,150 @@
+# utils/timers.py
+import asyncio
+import inspect
+import math
+import time
+
+from utils.logger import logger
+
+
+class Timer:
+    """Échéance enregistrée dans une TimerWheel (annulable, reprogrammable)."""
+
+    __slots__ = ("deadline", "callback", "args", "_wheel", "_slot")
+
+    def __init__(self, wheel, deadline, callback, args):
+        self._wheel = wheel
+        self.deadline = deadline
+        self.callback = callback
+        self.args = args
+        self._slot = None
+
+    @property
+    def active(self):
+        return self._slot is not None
+
+    def cancel(self):
+        self._wheel.cancel(self)
+
+    def reschedule(self, delay):
+        self._wheel.reschedule(self, delay)
+
+
+class TimerWheel:
+    """Roue de minuteurs hachée partagée par les cogs.
+
+    Une seule tâche asyncio avance la roue à chaque tick ; chaque
+    emplacement contient les minuteurs dont l'échéance tombe sur ce tick
+    (modulo le nombre d'emplacements). Programmer, reporter ou annuler
+    est en O(1) et ne crée aucune tâche : seul le déclenchement d'un
+    callback asynchrone en lance une.
+    """
+
+    def __init__(self, tick=1.0, slots=512):
+        self.tick = tick
+        self._slots = [dict() for _ in range(slots)]
+        self._cursor = int(time.monotonic() // tick)
+        self._task = None
+        self._wakeup = None
+        self.pending = 0
+        self.fired = 0
+        self.lag_max = 0.0
+        self._lag_total = 0.0
+
+    @property
+    def lag_avg(self):
+        return self._lag_total / self.fired if self.fired else 0.0
+
+    # ----- Programmation -----
+    def schedule(self, delay, callback, *args):
+        """Appelle `callback(*args)` dans `delay` secondes (coroutine ou fonction)."""
+        timer = Timer(self, time.monotonic() + max(delay, 0), callback, args)
+        self._place(timer)
+        self.pending += 1
+        self._ensure_running()
+        return timer
+
+    def reschedule(self, timer, delay):
+        """Repousse (ou avance) une échéance ; la réarme si elle a déjà expiré."""
+        if timer.active:
+            del self._slots[timer._slot][timer]
+        else:
+            self.pending += 1
+        timer.deadline = time.monotonic() + max(delay, 0)
+        self._place(timer)
+        self._ensure_running()
+
+    def cancel(self, timer):
+        if timer.active:
+            del self._slots[timer._slot][timer]
+            timer._slot = None
+            self.pending -= 1
+
+    def _place(self, timer):
+        # Jamais sur un tick déjà traité : au plus tôt sur le suivant
+        index = max(math.ceil(timer.deadline / self.tick), self._cursor + 1)
+        timer._slot = index % len(self._slots)
+        self._slots[timer._slot][timer] = None
+
+    # ----- Boucle -----
+    def _ensure_running(self):
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._cursor = int(time.monotonic() // self.tick)
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        elif self._wakeup is not None:
+            self._wakeup.set()
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self):
+        while True:
+            if self.pending == 0:
+                # Roue vide : on dort jusqu'au prochain minuteur
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                self._cursor = max(self._cursor, int(time.monotonic() // self.tick) - 1)
+            now = time.monotonic()
+            target = int(now // self.tick)
+            if target - self._cursor > len(self._slots):
+                # Gros retard (machine suspendue…) : un seul tour suffit
+                self._cursor = target - len(self._slots)
+            while self._cursor < target:
+                self._cursor += 1
+                self._fire_slot(self._cursor % len(self._slots), now)
+            await asyncio.sleep(max((self._cursor + 1) * self.tick - time.monotonic(), 0))
+
+    def _fire_slot(self, index, now):
+        slot = self._slots[index]
+        due = [timer for timer in slot if timer.deadline <= now]
+        for timer in due:
+            del slot[timer]
+            timer._slot = None
+            self.pending -= 1
+            lag = now - timer.deadline
+            self.fired += 1
+            self._lag_total += lag
+            self.lag_max = max(self.lag_max, lag)
+            try:
+                result = timer.callback(*timer.args)
+                if inspect.isawaitable(result):
+                    asyncio.ensure_future(self._guard(result))
+            except Exception as e:
+                logger.error(f"[Timers] Erreur dans un minuteur : {e}")
+
+    async def _guard(self, awaitable):
+        try:
+            await awaitable
+        except Exception as e:
+            logger.error(f"[Timers] Erreur dans un minuteur : {e}")
+
+
+async def delete_quietly(message):
+    """Supprime un message sans lever d'erreur s'il a déjà disparu."""
+    try:
+        await message.delete()
+    except Exception:
+        pass